@@ -0,0 +1,32 @@
+# benchmark_augmentations.py — per-transform cost of the background, distractor and logo augmentation pipelines
+import argparse
+import json
+from synthesis_generator.profiling import benchmark_pipelines, format_profile_table
+
+
+def main():
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Benchmark augmentation pipelines transform by transform on synthetic inputs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[128, 256, 512, 1024, 1920], help="Longer side of synthetic inputs (default: 128 256 512 1024 1920)")
+    parser.add_argument("--iterations", type=int, default=20, help="Pipeline calls per size (default: 20)")
+    parser.add_argument("--always_apply", action="store_true", help="Apply every transform on every call (p=1)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--json", type=str, default=None, help="Optional path to save raw results as JSON")
+    args = parser.parse_args()
+
+    # Debug prints
+    print(f"Sizes: {args.sizes}")
+    print(f"Iterations: {args.iterations}")
+    print(f"Always apply: {args.always_apply}")
+
+    stats = benchmark_pipelines(tuple(args.sizes), args.iterations, args.always_apply, args.seed)
+    print(format_profile_table(stats))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(stats, f, indent=2)
+        print(f"Saved results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
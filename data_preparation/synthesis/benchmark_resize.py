@@ -0,0 +1,48 @@
+# benchmark_resize.py — throughput and deviation from LANCZOS of the resize backends on crops and backgrounds
+import argparse
+import json
+from pathlib import Path
+from PIL import Image
+from synthesis_generator.resize import benchmark_resize, format_resize_table
+
+
+def main():
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Benchmark PIL/OpenCV resize backends against PIL LANCZOS on our assets")
+    parser.add_argument("--crops", type=str, default=None, help="Logo crops directory (default: <script dir>/crops)")
+    parser.add_argument("--bg", type=str, default=None, help="Backgrounds directory (default: <script dir>/backgrounds)")
+    parser.add_argument("--max_images", type=int, default=5, help="Images per kind (default: 5)")
+    parser.add_argument("--scales", type=float, nargs="+", default=[0.1, 0.25, 0.5, 0.75, 0.9, 1.5], help="Scale factors (default: 0.1 0.25 0.5 0.75 0.9 1.5)")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed resizes per image (default: 5)")
+    parser.add_argument("--json", type=str, default=None, help="Also save the rows to this JSON file")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+    crops_dir = Path(args.crops) if args.crops else script_dir / "crops"
+    bg_dir = Path(args.bg) if args.bg else script_dir / "backgrounds"
+
+    crops = sorted(crops_dir.glob("*.png"))[:args.max_images]
+    bgs = sorted(bg_dir.glob("*.jpg"))[:args.max_images]
+    images = [('crop', Image.open(path).convert("RGBA")) for path in crops]
+    images += [('background', Image.open(path).convert("RGB")) for path in bgs]
+
+    # Debug prints
+    print(f"Crops: {len(crops)} from {crops_dir}")
+    print(f"Backgrounds: {len(bgs)} from {bg_dir}")
+    print(f"Scales: {args.scales}, iterations: {args.iterations}")
+
+    if not images:
+        raise ValueError("No crops or backgrounds found.")
+
+    rows = benchmark_resize(images, scales=tuple(args.scales), iterations=args.iterations)
+    print("Resize backends (error vs PIL LANCZOS, premultiplied alpha for crops):")
+    print(format_resize_table(rows))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+        print(f"Saved rows to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
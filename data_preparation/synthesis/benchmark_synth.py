@@ -0,0 +1,59 @@
+# benchmark_synth.py — reproducible throughput / peak RSS benchmark of generate_synthetic_dataset
+import argparse
+import json
+from pathlib import Path
+from synthesis_generator.benchmark import BASE_CASE, DEFAULT_SWEEPS, build_cases, compare_reports, run_benchmark, save_report
+
+
+def main():
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Benchmark synthetic generation on a procedural fixture (no downloads)")
+    parser.add_argument("--out", type=str, default="synth_benchmark.json", help="Output JSON report (default: synth_benchmark.json)")
+    parser.add_argument("--fixture_dir", type=str, default=None, help="Fixture directory, reused between runs (default: <script dir>/.bench_fixture)")
+    parser.add_argument("--quick", action="store_true", help="Only the baseline case with N=50")
+    parser.add_argument("--N", type=int, nargs="+", default=DEFAULT_SWEEPS['N'], help="N values to sweep")
+    parser.add_argument("--max_neg", type=int, nargs="+", default=DEFAULT_SWEEPS['max_neg'], help="max_neg values to sweep")
+    parser.add_argument("--iou_threshold", type=float, nargs="+", default=DEFAULT_SWEEPS['iou_threshold'], help="iou_threshold values to sweep")
+    parser.add_argument("--bg_size", type=int, nargs="+", default=DEFAULT_SWEEPS['bg_size'], help="Background widths to sweep")
+    parser.add_argument("--max_logos", type=int, nargs="+", default=DEFAULT_SWEEPS['max_logos'], help="max_logos values to sweep")
+    parser.add_argument("--workers", type=int, default=1, help="Generator worker processes (default: 1)")
+    parser.add_argument("--repeats", type=int, default=1, help="Runs per case, the fastest is reported (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for fixture and generation (default: 0)")
+    parser.add_argument("--compare", type=str, default=None, help="Previous report to compare against")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+    fixture_dir = Path(args.fixture_dir) if args.fixture_dir else script_dir / ".bench_fixture"
+
+    if args.quick:
+        cases = build_cases({**BASE_CASE, 'N': 50}, sweeps={})
+    else:
+        sweeps = {
+            'N': args.N,
+            'max_neg': args.max_neg,
+            'iou_threshold': args.iou_threshold,
+            'bg_size': args.bg_size,
+            'max_logos': args.max_logos,
+        }
+        cases = build_cases(sweeps=sweeps)
+
+    # Debug prints
+    print(f"Fixture dir: {fixture_dir}")
+    print(f"Cases: {len(cases)}, repeats: {args.repeats}, workers: {args.workers}, seed: {args.seed}")
+
+    report = run_benchmark(cases, fixture_dir, fixture_dir / "work", seed=args.seed, repeats=args.repeats, workers=args.workers)
+    save_report(report, Path(args.out))
+    print(f"Saved report to {args.out}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            old = json.load(f)
+        print(f"Comparison with {args.compare} (commit {old.get('git_commit')}):")
+        for row in compare_reports(old, report):
+            case = ", ".join(f"{param}={row[param]}" for param in BASE_CASE)
+            rss = f", RSS x{row['rss_ratio']:.2f}" if row['rss_ratio'] else ""
+            print(f"  {case}: {row['images_per_sec_old']:.2f} -> {row['images_per_sec_new']:.2f} img/s (x{row['speedup']:.2f}{rss})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# build_sprite_atlas.py — offline pre-rendering of logo crops and distractors into a memory-mapped sprite atlas
+import argparse
+from pathlib import Path
+from synthesis_generator.augmentations import get_logo_aug_pipeline, get_neg_aug_pipeline
+from synthesis_generator.generator import load_background_objects
+from synthesis_generator.sprite_atlas import angle_levels, build_sprite_atlas, width_levels
+
+
+def main():
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Pre-render crops and distractors at quantized scales and rotations")
+    parser.add_argument("--out", type=str, default=None, help="Atlas directory (default: <script dir>/sprite_atlas)")
+    parser.add_argument("--ratio", type=float, default=1.25, help="Width ratio between neighbouring scale levels (default: 1.25)")
+    parser.add_argument("--logo_widths", type=int, nargs=2, default=[24, 864], help="Min and max logo sprite width in px (default: 24 864)")
+    parser.add_argument("--logo_angle_step", type=float, default=12.5, help="Logo rotation step in degrees within ±25 (default: 12.5)")
+    parser.add_argument("--neg_widths", type=int, nargs=2, default=[16, 384], help="Min and max distractor sprite width in px (default: 16 384)")
+    parser.add_argument("--neg_angle_step", type=float, default=22.5, help="Distractor rotation step in degrees within ±45 (default: 22.5)")
+    parser.add_argument("--variants", type=int, default=1, help="Stored variants per sprite; >1 adds augmented variants and skips runtime augmentation (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for augmented variants (default: 0)")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+
+    # Paths
+    crops_dir = script_dir / "crops"
+    bg_objects_dir = script_dir / "background_objects"
+    atlas_dir = Path(args.out) if args.out else script_dir / "sprite_atlas"
+
+    crops = sorted(str(f) for f in crops_dir.glob("*.png"))
+    bg_objects = sorted(load_background_objects(bg_objects_dir)) if bg_objects_dir.exists() else []
+
+    groups = [
+        {
+            'paths': crops,
+            'widths': width_levels(*args.logo_widths, ratio=args.ratio),
+            'angles': angle_levels(25, args.logo_angle_step),
+            'variants': args.variants,
+            'aug_pipeline': get_logo_aug_pipeline(),
+        },
+        {
+            'paths': bg_objects,
+            'widths': width_levels(*args.neg_widths, ratio=args.ratio),
+            'angles': angle_levels(45, args.neg_angle_step),
+            'variants': args.variants,
+            'aug_pipeline': get_neg_aug_pipeline(),
+        },
+    ]
+
+    # Debug prints
+    print(f"Crops: {len(crops)} in {crops_dir}")
+    print(f"Distractors: {len(bg_objects)} in {bg_objects_dir}")
+    print(f"Logo widths: {groups[0]['widths']}, angles: {groups[0]['angles']}")
+    print(f"Distractor widths: {groups[1]['widths']}, angles: {groups[1]['angles']}")
+    print(f"Variants: {args.variants}")
+    print(f"Atlas dir: {atlas_dir}")
+
+    index = build_sprite_atlas(groups, atlas_dir, seed=args.seed)
+    n_sprites = sum(len(asset['entries']) for asset in index['assets'].values())
+    print(f"Built atlas: {len(index['assets'])} assets, {n_sprites} sprites, {index['bytes'] / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,39 @@
+import argparse
 from synthesis_generator.crop_utils import crop_logos
 from pathlib import Path
 
-# Paths
-script_dir = Path(__file__).parent
 
-# Determine paths based on environment (Docker vs local)
-if Path("/app/data").exists():
-    # Docker environment
-    coco_path = "/app/data/tbank_official_logos/refs_ls_coco.json"
-    images_dir = "/app/data/tbank_official_logos/images"
-else:
-    # Local environment
-    coco_path = script_dir.parent.parent / "data" / "tbank_official_logos" / "refs_ls_coco.json"
-    images_dir = script_dir.parent.parent / "data" / "tbank_official_logos" / "images"
+def main():
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Crop logos from images by COCO annotations")
+    parser.add_argument("--coco", type=str, default=None, help="COCO annotations JSON (default: official refs_ls_coco.json)")
+    parser.add_argument("--images", type=str, default=None, help="Directory with the annotated images (default: official logo images)")
+    parser.add_argument("--crops", type=str, default=None, help="Output directory for crops (default: <script dir>/crops)")
+    parser.add_argument("--workers", type=int, default=None, help="Cropping processes (default: one per CPU, at most one per 16 images)")
+    args = parser.parse_args()
 
-crops_dir = script_dir / "crops"
+    # Paths
+    script_dir = Path(__file__).parent
 
-crop_logos(str(coco_path), str(images_dir), str(crops_dir))
\ No newline at end of file
+    # Determine paths based on environment (Docker vs local)
+    if Path("/app/data").exists():
+        # Docker environment
+        logos_dir = Path("/app/data/tbank_official_logos")
+    else:
+        # Local environment
+        logos_dir = script_dir.parent.parent / "data" / "tbank_official_logos"
+
+    coco_path = Path(args.coco) if args.coco else logos_dir / "refs_ls_coco.json"
+    images_dir = Path(args.images) if args.images else logos_dir / "images"
+    crops_dir = Path(args.crops) if args.crops else script_dir / "crops"
+
+    # Debug prints
+    print(f"COCO: {coco_path}")
+    print(f"Images dir: {images_dir}")
+    print(f"Crops dir: {crops_dir}")
+
+    crop_logos(str(coco_path), str(images_dir), str(crops_dir), workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
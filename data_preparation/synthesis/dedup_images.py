@@ -0,0 +1,66 @@
+# dedup_images.py — find and remove near-duplicate images in background / distractor pools by perceptual hash
+import argparse
+import json
+import shutil
+import time
+from pathlib import Path
+from synthesis_generator.dedup import HASH_CACHE, HASH_METHODS, find_duplicates, hash_directory
+
+
+def main():
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Find near-duplicate images by perceptual hash")
+    parser.add_argument("dirs", type=str, nargs="*", help="Image directories (default: backgrounds and background_objects)")
+    parser.add_argument("--method", type=str, default="dhash", choices=HASH_METHODS, help="Perceptual hash (default: dhash)")
+    parser.add_argument("--threshold", type=int, default=4, help="Max Hamming distance of 64-bit hashes treated as duplicates (default: 4)")
+    parser.add_argument("--action", type=str, default="report", choices=["report", "move", "delete"],
+                        help="report only, move duplicates to <dir>/.duplicates/ or delete them (default: report)")
+    parser.add_argument("--threads", type=int, default=None, help="Hashing threads (default: one per CPU)")
+    parser.add_argument("--json", type=str, default=None, help="Write duplicate lists per directory to this JSON file")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+    dirs = [Path(d) for d in args.dirs] or [script_dir / "backgrounds", script_dir / "background_objects"]
+
+    # Debug prints
+    print(f"Dirs: {[str(d) for d in dirs]}")
+    print(f"Method: {args.method}, threshold: {args.threshold}, action: {args.action}")
+
+    report = {}
+    for directory in dirs:
+        if not directory.exists():
+            print(f"Skipping missing directory: {directory}")
+            continue
+        t0 = time.perf_counter()
+        hashes = hash_directory(directory, args.method, args.threads)
+        t1 = time.perf_counter()
+        duplicates = find_duplicates(hashes, args.threshold)
+        t2 = time.perf_counter()
+        print(f"{directory}: {len(duplicates)} duplicates of {len(hashes)} images "
+              f"(hashing {t1 - t0:.2f}s, matching {t2 - t1:.2f}s)")
+        for name, kept, distance in duplicates[:20]:
+            print(f"  {name} ~ {kept} (distance {distance})")
+        if len(duplicates) > 20:
+            print(f"  ... {len(duplicates) - 20} more")
+
+        if args.action != "report" and duplicates:
+            trash = directory / ".duplicates"
+            for name, _, _ in duplicates:
+                if args.action == "move":
+                    trash.mkdir(exist_ok=True)
+                    shutil.move(str(directory / name), str(trash / name))
+                else:
+                    (directory / name).unlink()
+            hash_directory(directory, args.method, args.threads)  # drop removed files from the hash cache
+            print(f"  {'Moved' if args.action == 'move' else 'Deleted'} {len(duplicates)} files")
+        report[str(directory)] = [{'file': name, 'duplicate_of': kept, 'distance': distance} for name, kept, distance in duplicates]
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report: {args.json}")
+    print(f"Hash caches: <dir>/{HASH_CACHE.format(method=args.method)}")
+
+
+if __name__ == "__main__":
+    main()
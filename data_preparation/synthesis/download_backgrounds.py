@@ -1,4 +1,4 @@
-from synthesis_generator.background_utils import download_backgrounds
+from synthesis_generator.background_utils import PICSUM_URL, download_backgrounds
 from pathlib import Path
 import argparse
 
@@ -7,6 +7,11 @@ parser = argparse.ArgumentParser(description="Download background images for syn
 parser.add_argument("--num", type=int, default=1000, help="Number of backgrounds to download")
 parser.add_argument("--size", type=int, default=1920, help="Image size (default: 1920 for high-res)")
 parser.add_argument("--thematic", action="store_true", help="Use thematic backgrounds (requires API key)")
+parser.add_argument("--max_in_flight", type=int, default=16, help="Concurrent requests (default: 16)")
+parser.add_argument("--retries", type=int, default=4, help="Retries per image with exponential backoff (default: 4)")
+parser.add_argument("--dedup", action="store_true", help="Skip near-duplicates (dHash) of backgrounds already downloaded")
+parser.add_argument("--dedup_threshold", type=int, default=4, help="Max Hamming distance of 64-bit dHashes treated as duplicates (default: 4)")
+parser.add_argument("--base_url", type=str, default=PICSUM_URL, help=f"Picsum-compatible server (default: {PICSUM_URL})")
 args = parser.parse_args()
 
 # Конфигурация
@@ -15,5 +20,9 @@ backgrounds_dir = script_dir / "backgrounds"
 
 print(f"Downloading {args.num} backgrounds of size {args.size}x{args.size}")
 print(f"Thematic: {args.thematic}")
+print(f"Server: {args.base_url}, in flight: {args.max_in_flight}, retries: {args.retries}")
+print(f"Dedup: {args.dedup} (threshold {args.dedup_threshold})")
 
-download_backgrounds(str(backgrounds_dir), args.num, args.size, args.thematic)
\ No newline at end of file
+download_backgrounds(str(backgrounds_dir), args.num, args.size, args.thematic,
+                     max_in_flight=args.max_in_flight, retries=args.retries, base_url=args.base_url,
+                     dedup=args.dedup, dedup_threshold=args.dedup_threshold)
\ No newline at end of file
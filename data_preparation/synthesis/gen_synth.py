@@ -4,50 +4,133 @@ import argparse
 from pathlib import Path
 from synthesis_generator.generator import generate_synthetic_dataset
 
-# Parse arguments
-parser = argparse.ArgumentParser(description="Generate synthetic T-Bank logo images with advanced features")
-parser.add_argument("--N", type=int, default=1000, help="Number of synthetic images to generate (default: 1000)")
-parser.add_argument("--min_scale_down", type=float, default=0.5, help="Minimum background scale down factor (default: 0.5)")
-parser.add_argument("--iou_threshold", type=float, default=0.4, help="IoU threshold for logo placement (default: 0.4)")
-parser.add_argument("--max_neg", type=int, default=15, help="Maximum number of distractors per image (default: 15)")
-args = parser.parse_args()
-
-# Set env var for consistency
-os.environ['N'] = str(args.N)
-
-script_dir = Path(__file__).parent
-
-# Paths
-crops_dir = script_dir / "crops"
-bg_dir = script_dir / "backgrounds"
-bg_objects_dir = script_dir / "background_objects"  # New: distractors directory
-
-# Determine output base path (Docker vs local)
-if Path("/app/data").exists():
-    out_base = Path("/app/data") / "data_synt"
-else:
-    out_base = script_dir.parent.parent / "data" / "data_synt"
-
-N = int(os.getenv('N', 1000))  # Total synthetic images, from arg or env var
-
-# Debug prints
-print(f"Script dir: {script_dir}")
-print(f"Crops dir: {crops_dir}")
-print(f"Bg dir: {bg_dir}")
-print(f"Bg objects dir: {bg_objects_dir} (exists: {bg_objects_dir.exists()})")
-print(f"Out base: {out_base}")
-print(f"N: {N}")
-print(f"Min scale down: {args.min_scale_down}")
-print(f"IoU threshold: {args.iou_threshold}")
-print(f"Max distractors: {args.max_neg}")
-
-generate_synthetic_dataset(
-    crops_dir,
-    bg_dir,
-    out_base,
-    N,
-    bg_objects_dir=bg_objects_dir,
-    min_scale_down=args.min_scale_down,
-    iou_threshold=args.iou_threshold,
-    max_neg=args.max_neg
-)
\ No newline at end of file
+
+def main():
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Generate synthetic T-Bank logo images with advanced features")
+    parser.add_argument("--N", type=int, default=1000, help="Number of synthetic images to generate (default: 1000)")
+    parser.add_argument("--min_scale_down", type=float, default=0.5, help="Minimum background scale down factor (default: 0.5)")
+    parser.add_argument("--iou_threshold", type=float, default=0.4, help="IoU threshold for logo placement (default: 0.4)")
+    parser.add_argument("--max_neg", type=int, default=15, help="Maximum number of distractors per image (default: 15)")
+    parser.add_argument("--max_logos", type=int, default=10, help="Maximum number of logos per image (default: 10)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes (default: 1)")
+    parser.add_argument("--seed", type=int, default=None, help="Base random seed for shard seeds (default: random)")
+    parser.add_argument("--shard_size", type=int, default=100, help="Images per shard (default: 100)")
+    parser.add_argument("--asset_cache_mb", type=int, default=512, help="Decoded crop/distractor cache budget per worker in MB (default: 512)")
+    parser.add_argument("--placement", type=str, default="random", choices=["random", "grid"], help="Logo placement mode: rejection sampling or occupancy grid (default: random)")
+    parser.add_argument("--bg_pyramid", action="store_true", help="Read backgrounds from a persisted multi-scale pyramid (backgrounds/.pyramid)")
+    parser.add_argument("--compositing", type=str, default="pil", choices=["pil", "numpy"], help="Compositing path: PIL paste or single NumPy canvas (default: pil)")
+    parser.add_argument("--resume", action="store_true", help="Resume an interrupted run from out_base/manifest.json")
+    parser.add_argument("--extend", action="store_true", help="Append N more images to the dataset in out_base")
+    parser.add_argument("--emit_recipes", action="store_true", help="Write per-image render recipes to out_base/recipes.jsonl")
+    parser.add_argument("--output_format", type=str, default="files", choices=["files", "tar"], help="Output layout: image/label files or packed tar shards in out_base/packed (default: files)")
+    parser.add_argument("--profile_augmentations", action="store_true", help="Record per-transform augmentation time and print a summary table")
+    parser.add_argument("--aug_budget_ms", type=float, default=None, help="Per-image augmentation time budget in ms; expensive transforms are downscaled or skipped (default: no budget)")
+    parser.add_argument("--aug_costs", type=str, default=None, help="Per-transform costs JSON (transform_profile.json or benchmark_augmentations.py --json); calibrated on start if omitted")
+    parser.add_argument("--write_threads", type=int, default=2, help="Encode/write threads per worker, 0 writes inline (default: 2)")
+    parser.add_argument("--write_queue", type=int, default=8, help="Maximum images waiting to be written per worker (default: 8)")
+    parser.add_argument("--jpeg_backend", type=str, default="pil", choices=["pil", "opencv", "auto"], help="JPEG encoder; auto picks the fastest by micro-benchmark (default: pil)")
+    parser.add_argument("--class_targets", type=str, default="balanced", help="Per-class logo instance targets: 'balanced', 'random' (no plan) or counts 'purple,white,yellow', e.g. 2000,2000,2000 (default: balanced)")
+    parser.add_argument("--sprite_atlas", type=str, default=None, help="Sprite atlas directory from build_sprite_atlas.py (default: transform sprites at runtime)")
+    parser.add_argument("--prometheus", type=str, default=None, help="Also write per-stage timing percentiles in Prometheus text format to this file")
+    parser.add_argument("--resize_backend", type=str, default="lanczos", choices=["lanczos", "pil", "opencv"], help="Resize backend for backgrounds and sprites; pil/opencv pick area or linear kernels by scale (default: lanczos)")
+    parser.add_argument("--asset_pool_mb", type=int, default=0, help="Shared memory pool of decoded crops/distractors for all workers in MB, 0 disables (default: 0)")
+    parser.add_argument("--pool_backgrounds", action="store_true", help="Also decode backgrounds into the shared pool (faster loads, more memory)")
+    parser.add_argument("--procedural_backgrounds", type=float, default=0.0, help="Share of backgrounds synthesized on the fly instead of loaded; 1 needs no background files (default: 0)")
+    parser.add_argument("--procedural_size", type=int, nargs=2, default=[1920, 1920], help="Width and height of procedural backgrounds before the random downscale (default: 1920 1920)")
+    args = parser.parse_args()
+
+    if args.class_targets == "balanced":
+        class_targets = "balanced"
+    elif args.class_targets == "random":
+        class_targets = None
+    else:
+        class_targets = dict(enumerate(int(n) for n in args.class_targets.split(",")))
+
+    # Set env var for consistency
+    os.environ['N'] = str(args.N)
+
+    script_dir = Path(__file__).parent
+
+    # Paths
+    crops_dir = script_dir / "crops"
+    bg_dir = script_dir / "backgrounds"
+    bg_objects_dir = script_dir / "background_objects"  # New: distractors directory
+
+    # Determine output base path (Docker vs local)
+    if Path("/app/data").exists():
+        out_base = Path("/app/data") / "data_synt"
+    else:
+        out_base = script_dir.parent.parent / "data" / "data_synt"
+
+    N = int(os.getenv('N', 1000))  # Total synthetic images, from arg or env var
+
+    # Debug prints
+    print(f"Script dir: {script_dir}")
+    print(f"Crops dir: {crops_dir}")
+    print(f"Bg dir: {bg_dir}")
+    print(f"Bg objects dir: {bg_objects_dir} (exists: {bg_objects_dir.exists()})")
+    print(f"Out base: {out_base}")
+    print(f"N: {N}")
+    print(f"Min scale down: {args.min_scale_down}")
+    print(f"IoU threshold: {args.iou_threshold}")
+    print(f"Max distractors: {args.max_neg}")
+    print(f"Max logos: {args.max_logos}")
+    print(f"Class targets: {class_targets}")
+    print(f"Sprite atlas: {args.sprite_atlas}")
+    print(f"Prometheus metrics: {args.prometheus}")
+    print(f"Workers: {args.workers}, seed: {args.seed}, shard size: {args.shard_size}")
+    print(f"Asset cache: {args.asset_cache_mb} MB")
+    print(f"Shared asset pool: {args.asset_pool_mb} MB, backgrounds: {args.pool_backgrounds}")
+    print(f"Procedural backgrounds: {args.procedural_backgrounds}, size: {args.procedural_size}")
+    print(f"Placement: {args.placement}")
+    print(f"Background pyramid: {args.bg_pyramid}")
+    print(f"Compositing: {args.compositing}")
+    print(f"Resume: {args.resume}, extend: {args.extend}")
+    print(f"Emit recipes: {args.emit_recipes}")
+    print(f"Output format: {args.output_format}")
+    print(f"Profile augmentations: {args.profile_augmentations}")
+    print(f"Resize backend: {args.resize_backend}")
+    print(f"Writer: {args.write_threads} threads, queue {args.write_queue}, JPEG backend {args.jpeg_backend}")
+    print(f"Augmentation budget: {args.aug_budget_ms} ms, costs: {args.aug_costs}")
+
+    generate_synthetic_dataset(
+        crops_dir,
+        bg_dir,
+        out_base,
+        N,
+        bg_objects_dir=bg_objects_dir,
+        min_scale_down=args.min_scale_down,
+        iou_threshold=args.iou_threshold,
+        max_neg=args.max_neg,
+        max_logos=args.max_logos,
+        workers=args.workers,
+        seed=args.seed,
+        shard_size=args.shard_size,
+        asset_cache_mb=args.asset_cache_mb,
+        placement_mode=args.placement,
+        bg_pyramid=args.bg_pyramid,
+        compositing=args.compositing,
+        resume=args.resume,
+        extend=args.extend,
+        emit_recipes=args.emit_recipes,
+        output_format=args.output_format,
+        profile_augmentations=args.profile_augmentations,
+        aug_budget_ms=args.aug_budget_ms,
+        aug_costs_path=Path(args.aug_costs) if args.aug_costs else None,
+        write_threads=args.write_threads,
+        write_queue=args.write_queue,
+        jpeg_backend=args.jpeg_backend,
+        class_targets=class_targets,
+        sprite_atlas_dir=Path(args.sprite_atlas) if args.sprite_atlas else None,
+        prometheus_path=Path(args.prometheus) if args.prometheus else None,
+        resize_backend=args.resize_backend,
+        asset_pool_mb=args.asset_pool_mb,
+        pool_backgrounds=args.pool_backgrounds,
+        procedural_backgrounds=args.procedural_backgrounds,
+        procedural_size=tuple(args.procedural_size)
+    )
+
+
+if __name__ == "__main__":
+    main()
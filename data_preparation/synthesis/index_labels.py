@@ -0,0 +1,46 @@
+# index_labels.py — build a columnar box index (labels_index.npz) for an existing YOLO dataset and print its summary
+import argparse
+from pathlib import Path
+from synthesis_generator.label_index import INDEX_NAME, LabelIndex, SPLITS, index_dataset, save_index
+
+
+def main():
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Index YOLO labels into a columnar .npz for fast statistics")
+    parser.add_argument("--data", type=str, default=None, help="Dataset directory with images/ and labels/ or packed/ (default: data/data_synt)")
+    parser.add_argument("--packed", type=str, default=None, help="Index tar shards from this directory instead of label files")
+    parser.add_argument("--out", type=str, default=None, help=f"Output index (default: <data>/{INDEX_NAME})")
+    parser.add_argument("--no_sizes", action="store_true", help="Do not read image sizes (no pixel-size statistics)")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+
+    # Determine dataset path (Docker vs local)
+    if args.data:
+        data_dir = Path(args.data)
+    elif Path("/app/data").exists():
+        data_dir = Path("/app/data") / "data_synt"
+    else:
+        data_dir = script_dir.parent.parent / "data" / "data_synt"
+    out_path = Path(args.out) if args.out else data_dir / INDEX_NAME
+
+    # Debug prints
+    print(f"Data dir: {data_dir}")
+    print(f"Packed dir: {args.packed}")
+    print(f"Out: {out_path}")
+    print(f"Read image sizes: {not args.no_sizes}")
+
+    index = index_dataset(data_dir, packed_dir=Path(args.packed) if args.packed else None, read_sizes=not args.no_sizes)
+    save_index(out_path, index)
+
+    labels = LabelIndex(index)
+    print(f"Indexed {len(labels)} boxes of {len(index['images'])} images")
+    for split in SPLITS:
+        split_labels = labels.where(split=split)
+        print(f"  {split}: {len(split_labels)} boxes, classes {split_labels.class_counts()}")
+    print(f"Box width px percentiles (5/50/95): {labels.percentiles('w_px')}")
+    print(f"Small boxes (< 32x32 px): {labels.small_share():.1%}")
+
+
+if __name__ == "__main__":
+    main()
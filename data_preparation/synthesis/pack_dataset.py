@@ -0,0 +1,42 @@
+# pack_dataset.py — pack a synthetic dataset into tar shards or unpack shards back to image/label files
+import argparse
+from pathlib import Path
+from synthesis_generator.shards import pack_dataset, unpack_shards
+
+
+def main():
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Pack YOLO dataset into indexed tar shards or unpack them")
+    parser.add_argument("--data", type=str, default=None, help="Dataset directory with images/ and labels/ (default: data/data_synt)")
+    parser.add_argument("--packed", type=str, default=None, help="Directory with tar shards (default: <data>/packed)")
+    parser.add_argument("--max_count", type=int, default=1000, help="Samples per tar shard (default: 1000)")
+    parser.add_argument("--unpack", action="store_true", help="Unpack shards into <data>/images and <data>/labels, skipping existing files")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+
+    # Determine dataset path (Docker vs local)
+    if args.data:
+        data_dir = Path(args.data)
+    elif Path("/app/data").exists():
+        data_dir = Path("/app/data") / "data_synt"
+    else:
+        data_dir = script_dir.parent.parent / "data" / "data_synt"
+    packed_dir = Path(args.packed) if args.packed else data_dir / "packed"
+
+    # Debug prints
+    print(f"Data dir: {data_dir}")
+    print(f"Packed dir: {packed_dir}")
+    print(f"Mode: {'unpack' if args.unpack else 'pack'}")
+
+    if args.unpack:
+        counts = unpack_shards(packed_dir, data_dir)
+        print(f"Unpacked samples per split: {counts}")
+    else:
+        print(f"Max count: {args.max_count}")
+        counts = pack_dataset(data_dir, packed_dir, max_count=args.max_count)
+        print(f"Packed samples per split: {counts}")
+
+
+if __name__ == "__main__":
+    main()
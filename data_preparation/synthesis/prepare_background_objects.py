@@ -7,13 +7,16 @@ to create hard negatives for training the logo detector.
 """
 
 import os
-import requests
 from pathlib import Path
-from tqdm import tqdm
 import argparse
+from synthesis_generator.dedup import build_hash_index, hash_directory, image_hash
+from synthesis_generator.downloader import download_files
 
-def download_distractors(output_dir: str, num_images: int = 200) -> None:
-    """Download distractor images from various sources."""
+def download_distractors(output_dir: str, num_images: int = 200, max_in_flight: int = 16, retries: int = 4, dedup: bool = False) -> None:
+    """Download distractor images from various sources, concurrently and skipping files already on disk.
+
+    With ``dedup`` near-duplicates of distractors already in output_dir are not saved.
+    """
     os.makedirs(output_dir, exist_ok=True)
 
     # Sources for distractors (logos of other banks, generic emblems, etc.)
@@ -30,30 +33,31 @@ def download_distractors(output_dir: str, num_images: int = 200) -> None:
     for i in range(num_images - len(sources)):
         sources.append(f"https://picsum.photos/200/200?random={i+1000}")
 
-    successful = 0
-    for i, url in enumerate(tqdm(sources[:num_images], desc="Downloading distractors")):
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                ext = '.png' if 'png' in url else '.jpg'
-                filename = f"distractor_{i:03d}{ext}"
-                filepath = os.path.join(output_dir, filename)
-                with open(filepath, "wb") as f:
-                    f.write(response.content)
-                successful += 1
-        except Exception as e:
-            print(f"Failed to download {url}: {e}")
-
-    print(f"Downloaded {successful}/{num_images} distractor images to {output_dir}")
+    jobs = [(url, os.path.join(output_dir, f"distractor_{i:03d}{'.png' if 'png' in url else '.jpg'}"))
+            for i, url in enumerate(sources[:num_images])]
+    accept = None
+    if dedup:
+        index = build_hash_index(output_dir)
+        accept = lambda path, content: index.add_if_new(Path(path).name, image_hash(content)) is None
+
+    stats = download_files(jobs, max_in_flight=max_in_flight, timeout=10, retries=retries, desc="Downloading distractors", accept=accept)
+    if dedup:
+        hash_directory(output_dir)  # cache hashes of the new files
+
+    print(f"Downloaded {stats['downloaded']}/{num_images} distractor images to {output_dir} "
+          f"({stats['skipped']} already present, {stats['rejected']} duplicates, {stats['failed']} failed)")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Prepare background objects for synthesis")
     parser.add_argument("--output", type=str, default="background_objects", help="Output directory")
     parser.add_argument("--num", type=int, default=200, help="Number of distractor images")
+    parser.add_argument("--max_in_flight", type=int, default=16, help="Concurrent requests")
+    parser.add_argument("--retries", type=int, default=4, help="Retries per image with exponential backoff")
+    parser.add_argument("--dedup", action="store_true", help="Skip near-duplicates of distractors already downloaded")
     args = parser.parse_args()
 
     script_dir = Path(__file__).parent
     output_dir = script_dir / args.output
 
     print(f"Preparing {args.num} distractor images in {output_dir}")
-    download_distractors(str(output_dir), args.num)
\ No newline at end of file
+    download_distractors(str(output_dir), args.num, args.max_in_flight, args.retries, args.dedup)
\ No newline at end of file
@@ -0,0 +1,35 @@
+# render_recipes.py — re-render a synthetic dataset from its recipes at another resolution or JPEG quality
+import argparse
+from pathlib import Path
+from synthesis_generator.recipes import render_from_recipes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-render synthetic T-Bank logo images from recipes.jsonl")
+    parser.add_argument("--recipes", type=str, default=None, help="Path to recipes.jsonl (default: <data>/data_synt/recipes.jsonl)")
+    parser.add_argument("--out", type=str, default=None, help="Output directory (default: <data>/data_synt_<imgsz>)")
+    parser.add_argument("--imgsz", type=int, default=None, help="Longer side of output images (default: recorded size)")
+    parser.add_argument("--quality", type=int, default=90, help="JPEG quality (default: 90)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes (default: 1)")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+
+    # Determine data path (Docker vs local)
+    if Path("/app/data").exists():
+        data_dir = Path("/app/data")
+    else:
+        data_dir = script_dir.parent.parent / "data"
+
+    recipes_path = Path(args.recipes) if args.recipes else data_dir / "data_synt" / "recipes.jsonl"
+    out_base = Path(args.out) if args.out else data_dir / f"data_synt_{args.imgsz or 'orig'}_q{args.quality}"
+
+    print(f"Recipes: {recipes_path}")
+    print(f"Out base: {out_base}")
+    print(f"imgsz: {args.imgsz}, quality: {args.quality}, workers: {args.workers}")
+
+    render_from_recipes(recipes_path, out_base, imgsz=args.imgsz, quality=args.quality, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
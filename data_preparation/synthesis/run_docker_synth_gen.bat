@@ -1,10 +1,11 @@
 @echo off
 REM Docker script for generating synthetic data
-REM Usage: run_docker_synth_gen.bat [N] [min_scale_down] [iou_threshold] [max_neg]
+REM Usage: run_docker_synth_gen.bat [N] [min_scale_down] [iou_threshold] [max_neg] [workers]
 REM   N: number of images (default: 1000)
 REM   min_scale_down: min background scale (default: 0.5)
 REM   iou_threshold: IoU threshold for logos (default: 0.4)
 REM   max_neg: max distractors per image (default: 15)
+REM   workers: number of worker processes (default: 1)
 
 set N_VAL=%1
 if "%N_VAL%"=="" set N_VAL=1000
@@ -18,9 +19,12 @@ if "%IOU_VAL%"=="" set IOU_VAL=0.4
 set NEG_VAL=%4
 if "%NEG_VAL%"=="" set NEG_VAL=15
 
+set WORKERS_VAL=%5
+if "%WORKERS_VAL%"=="" set WORKERS_VAL=1
+
 echo Starting synthetic data generation...
 echo ==========================================
-echo Parameters: N=%N_VAL%, scale_down=%SCALE_VAL%, iou=%IOU_VAL%, max_neg=%NEG_VAL%
+echo Parameters: N=%N_VAL%, scale_down=%SCALE_VAL%, iou=%IOU_VAL%, max_neg=%NEG_VAL%, workers=%WORKERS_VAL%
 echo ==========================================
 
 REM Переходим в корень проекта
@@ -36,7 +40,7 @@ echo Root: %ROOT_PATH%
 echo Synthesis: %SYNTH_PATH%
 echo Data: %DATA_PATH%
 
-docker run -v "%SYNTH_PATH%:/app/synthesis" -v "%DATA_PATH%:/app/data" --rm medphisiker/tbank-synth:latest python gen_synth.py --N %N_VAL% --min_scale_down %SCALE_VAL% --iou_threshold %IOU_VAL% --max_neg %NEG_VAL%
+docker run -v "%SYNTH_PATH%:/app/synthesis" -v "%DATA_PATH%:/app/data" --rm medphisiker/tbank-synth:latest python gen_synth.py --N %N_VAL% --min_scale_down %SCALE_VAL% --iou_threshold %IOU_VAL% --max_neg %NEG_VAL% --workers %WORKERS_VAL%
 
 echo.
 echo Synthetic data generation completed!
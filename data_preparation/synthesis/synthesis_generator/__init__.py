@@ -4,4 +4,5 @@ Synthesis Generator Package for T-Bank Logo Detection
 This package contains utilities for generating synthetic data for logo detection.
 """
 
-__version__ = "0.1.0"
\ No newline at end of file
+# Bump on every change to rendered output for a fixed seed: resume/extend warns on a mismatch
+__version__ = "0.2.0"
\ No newline at end of file
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from PIL import Image
+import numpy as np
+
+
+class AssetCache:
+    """In-process LRU store of decoded RGBA assets with a memory budget.
+
+    Keeps decoded crops and distractors as read-only uint8 arrays keyed by
+    path, evicting least recently used entries once ``max_bytes`` is exceeded.
+    Assets found in ``pool`` (a ``shared_pool.SharedAssetPool``) are served
+    from shared memory and take no space in the cache.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024, pool=None):
+        self.max_bytes = max_bytes
+        self.pool = pool
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path) -> bool:
+        return str(path) in self._entries
+
+    def get(self, path) -> np.ndarray:
+        """Return decoded RGBA array for path, decoding it on a miss."""
+        key = str(path)
+        if self.pool is not None:
+            arr = self.pool.get(key)
+            if arr is not None:
+                return arr
+        arr = self._entries.get(key)
+        if arr is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return arr
+
+        self.misses += 1
+        arr = np.array(Image.open(key).convert("RGBA"))
+        arr.flags.writeable = False
+        if arr.nbytes <= self.max_bytes:
+            self._entries[key] = arr
+            self.nbytes += arr.nbytes
+            self._evict()
+        return arr
+
+    def get_image(self, path) -> Image.Image:
+        """Return decoded RGBA asset as a PIL image."""
+        return Image.fromarray(self.get(path))
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the budget is met."""
+        while self.nbytes > self.max_bytes and self._entries:
+            _, arr = self._entries.popitem(last=False)
+            self.nbytes -= arr.nbytes
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        self._entries.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and memory usage."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+            'bytes': self.nbytes,
+            'max_bytes': self.max_bytes,
+            'pool_hits': self.pool.hits if self.pool is not None else 0,
+        }
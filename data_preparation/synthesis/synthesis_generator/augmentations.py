@@ -1,4 +1,6 @@
+import random
 import albumentations as A
+import numpy as np
 
 
 def get_augmentation_pipeline():
@@ -46,4 +48,23 @@ def get_logo_aug_pipeline():
         A.HueSaturationValue(p=0.5, hue_shift_limit=5, sat_shift_limit=10, val_shift_limit=15),
         A.GaussNoise(p=0.4, var_limit=(5, 20)),
         A.ElasticTransform(p=0.2, alpha=1, sigma=50),
-    ])
\ No newline at end of file
+    ])
+
+
+def apply_seeded_pipeline(pipeline, seed: int, **data) -> dict:
+    """Apply pipeline with its randomness fixed by seed, so the call can be replayed.
+
+    The global ``random`` and ``np.random`` states are restored afterwards.
+    """
+    state = random.getstate()
+    np_state = np.random.get_state()
+    random.seed(seed)
+    np.random.seed(seed)
+    # Newer albumentations keep their own RNG per Compose
+    if hasattr(pipeline, 'set_random_seed'):
+        pipeline.set_random_seed(seed)
+    try:
+        return pipeline(**data)
+    finally:
+        random.setstate(state)
+        np.random.set_state(np_state)
@@ -0,0 +1,131 @@
+import os
+from pathlib import Path
+from PIL import Image
+import numpy as np
+from .resize import resize_image
+
+# Reduced levels only: a persisted 1.0 level would be an uncompressed copy of every background;
+# scales above 0.75 are upscaled from the 0.75 level
+DEFAULT_LEVELS = (0.75, 0.5)
+
+
+class BackgroundCache:
+    """Multi-scale pyramid of background images with decode-at-scale.
+
+    Each background is stored at the scales in ``levels`` as ``.npy`` files in a
+    ``.pyramid`` directory next to the originals and read back memory-mapped.
+    A background at ``scale_down`` is taken from the smallest level that is not
+    smaller than the target, so the JPEG is never fully decoded again. Targets
+    above the largest level are upscaled from it (at most 1.33x with the default
+    levels), which is cheap but softer than the original; a full-size level
+    (``levels=(1.0, 0.75, 0.5)``) keeps full detail at the cost of storing every
+    background uncompressed. Targets below the smallest level are decoded
+    straight from the JPEG at reduced scale (DCT scaling via ``Image.draft``).
+    With ``snap=True`` the nearest level is returned as is, without any resize.
+    Resizes to the target, from a level or after a direct decode, use
+    ``resize_backend`` (see ``resize.resize_image``); levels are built with LANCZOS.
+    """
+
+    def __init__(self, levels: tuple = DEFAULT_LEVELS, persist: bool = True, snap: bool = False, resize_backend: str = 'lanczos'):
+        self.levels = sorted(levels, reverse=True)
+        self.persist = persist
+        self.snap = snap
+        self.resize_backend = resize_backend
+        self.hits = 0
+        self.disk_loads = 0
+        self.builds = 0
+        self.direct_decodes = 0
+        self.upscales = 0
+        self._arrays = {}
+        self._sizes = {}
+
+    def original_size(self, bg_path: str) -> tuple:
+        """Return (W, H) of the original background, read from the header only."""
+        size = self._sizes.get(bg_path)
+        if size is None:
+            with Image.open(bg_path) as img:
+                size = img.size
+            self._sizes[bg_path] = size
+        return size
+
+    def level_path(self, bg_path: str, level: float) -> Path:
+        """Path of the persisted pyramid level for a background."""
+        bg_path = Path(bg_path)
+        return bg_path.parent / '.pyramid' / f"{bg_path.stem}_{level:.3f}.npy"
+
+    @staticmethod
+    def decode_at_scale(bg_path: str, size: tuple, resize_backend: str = 'lanczos') -> np.ndarray:
+        """Decode JPEG directly at reduced scale and resize to exact size with resize_backend."""
+        with Image.open(bg_path) as img:
+            img.draft('RGB', size)
+            img = img.convert('RGB')
+        if img.size != size:
+            img = resize_image(img, size, resize_backend)
+        return np.asarray(img)
+
+    def get_level(self, bg_path: str, level: float) -> np.ndarray:
+        """Return pyramid level of a background, building it on first use."""
+        key = (bg_path, level)
+        arr = self._arrays.get(key)
+        if arr is not None:
+            self.hits += 1
+            return arr
+
+        W_orig, H_orig = self.original_size(bg_path)
+        size = (int(W_orig * level), int(H_orig * level))
+        npy_path = self.level_path(bg_path, level)
+
+        if self.persist and npy_path.exists() and npy_path.stat().st_mtime >= Path(bg_path).stat().st_mtime:
+            arr = np.load(npy_path, mmap_mode='r')
+            self.disk_loads += 1
+        else:
+            arr = self.decode_at_scale(bg_path, size)
+            self.builds += 1
+            if self.persist:
+                # Write to a temp file first: several workers may build the same level
+                npy_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = npy_path.with_name(f"{npy_path.stem}.{os.getpid()}.tmp.npy")
+                np.save(tmp_path, arr)
+                os.replace(tmp_path, npy_path)
+                arr = np.load(npy_path, mmap_mode='r')
+
+        self._arrays[key] = arr
+        return arr
+
+    def build(self, bg_paths: list) -> None:
+        """Build and persist all pyramid levels for the given backgrounds."""
+        for bg_path in bg_paths:
+            for level in self.levels:
+                self.get_level(bg_path, level)
+
+    def load(self, bg_path: str, scale_down: float) -> Image.Image:
+        """Return background resized by scale_down, using the nearest pyramid level."""
+        if self.snap:
+            level = min(self.levels, key=lambda l: abs(l - scale_down))
+            return Image.fromarray(np.asarray(self.get_level(bg_path, level)))
+
+        W_orig, H_orig = self.original_size(bg_path)
+        size = (int(W_orig * scale_down), int(H_orig * scale_down))
+
+        if scale_down < self.levels[-1]:
+            self.direct_decodes += 1
+            return Image.fromarray(self.decode_at_scale(bg_path, size, self.resize_backend))
+
+        larger = [level for level in self.levels if level >= scale_down]
+        if not larger:
+            self.upscales += 1
+        bg = Image.fromarray(np.asarray(self.get_level(bg_path, min(larger, default=self.levels[0]))))
+        if bg.size != size:
+            bg = resize_image(bg, size, self.resize_backend)
+        return bg
+
+    def stats(self) -> dict:
+        """Return cache counters."""
+        return {
+            'hits': self.hits,
+            'disk_loads': self.disk_loads,
+            'builds': self.builds,
+            'direct_decodes': self.direct_decodes,
+            'upscales': self.upscales,
+            'levels': len(self._arrays),
+        }
@@ -1,10 +1,24 @@
 import os
-import requests
-from tqdm import tqdm
+from pathlib import Path
+from PIL import Image
+import numpy as np
+from .dedup import build_hash_index, hash_directory, image_hash
+from .downloader import download_files
 
+PICSUM_URL = "https://picsum.photos"
 
-def download_backgrounds(backgrounds_dir: str, num_backgrounds: int = 1000, img_size: int = 1920, thematic: bool = False) -> None:
-    """Download background images from Picsum or Unsplash API."""
+
+def download_backgrounds(backgrounds_dir: str, num_backgrounds: int = 1000, img_size: int = 1920, thematic: bool = False,
+                         max_in_flight: int = 16, retries: int = 4, base_url: str = PICSUM_URL,
+                         dedup: bool = False, dedup_threshold: int = 4) -> dict:
+    """Download background images from Picsum or Unsplash API.
+
+    Images are fetched concurrently with retries; backgrounds already on disk
+    are kept, so re-running resumes an interrupted download. ``base_url``
+    points the download at a Picsum-compatible mirror. With ``dedup`` images
+    within ``dedup_threshold`` bits (dHash) of a background already in the
+    directory are not saved; a re-run fetches new images for those slots.
+    """
     os.makedirs(backgrounds_dir, exist_ok=True)
 
     if thematic:
@@ -12,24 +26,178 @@ def download_backgrounds(backgrounds_dir: str, num_backgrounds: int = 1000, img_
         # For now, fallback to Picsum with larger size
         print("Thematic backgrounds require Unsplash API key. Using high-res Picsum instead.")
         img_size = 1920
-        urls = [f"https://picsum.photos/{img_size}/{img_size}?random={i}" for i in range(num_backgrounds)]
+    jobs = [(f"{base_url}/{img_size}/{img_size}?random={i}", os.path.join(backgrounds_dir, f"bg_{i:04d}.jpg"))
+            for i in range(num_backgrounds)]
+
+    accept = None
+    if dedup:
+        index = build_hash_index(backgrounds_dir, threshold=dedup_threshold)
+        accept = lambda path, content: index.add_if_new(Path(path).name, image_hash(content)) is None
+
+    stats = download_files(jobs, max_in_flight=max_in_flight, retries=retries, desc="Downloading backgrounds", accept=accept)
+    if dedup:
+        hash_directory(backgrounds_dir)  # cache hashes of the new files
+
+    print(f"Downloaded {stats['downloaded']}/{num_backgrounds} backgrounds to {backgrounds_dir} "
+          f"({stats['skipped']} already present, {stats['rejected']} duplicates, {stats['failed']} failed, {stats['retries']} retries, "
+          f"{stats['bytes'] / 1024 / 1024:.1f} MB in {stats['seconds']:.1f}s)")
+    print(f"Image size: {img_size}x{img_size}, Thematic: {thematic}")
+    return stats
+
+
+# Procedural background styles; clutter (text-like blocks) is added on top of any style
+BACKGROUND_STYLES = ('noise', 'gradient', 'paper', 'fabric')
+
+# Smooth fields are computed at 1 / FIELD_REDUCTION of the target size and upsampled once
+FIELD_REDUCTION = 4
+
+
+def _axis_weights(cells: int, size: int) -> tuple:
+    pos = np.linspace(0, cells - 1, size, dtype=np.float32)
+    i0 = np.minimum(pos.astype(np.int32), cells - 2)
+    t = pos - i0
+    return i0, t * t * (3 - 2 * t)
+
+
+def _upsample(grid: np.ndarray, height: int, width: int) -> np.ndarray:
+    """Smoothstep-interpolate a (gh, gw) float32 grid to (height, width), one axis at a time."""
+    ix, tx = _axis_weights(grid.shape[1], width)
+    rows = grid[:, ix] + (grid[:, ix + 1] - grid[:, ix]) * tx
+    iy, ty = _axis_weights(grid.shape[0], height)
+    out = (rows[1:] - rows[:-1])[iy]
+    out *= ty[:, None]
+    out += rows[iy]
+    return out
+
+
+def fractal_noise(width: int, height: int, rng: np.random.Generator, octaves: int = 5, cells: int = 4, persistence: float = 0.5) -> np.ndarray:
+    """Multi-octave value noise in [0, 1] as a float32 (height, width) array.
+
+    Octave k has ``cells * 2**k`` random values along the longer side and
+    weight ``persistence**k``.
+    """
+    noise = np.zeros((height, width), dtype=np.float32)
+    amplitude, total = 1.0, 0.0
+    for k in range(octaves):
+        n = cells * 2 ** k
+        gw, gh = (n, max(2, round(n * height / width))) if width >= height else (max(2, round(n * width / height)), n)
+        grid = rng.random((gh + 1, gw + 1), dtype=np.float32)
+        noise += np.float32(amplitude) * _upsample(grid, height, width)
+        total += amplitude
+        amplitude *= persistence
+    lo, hi = noise.min(), noise.max()
+    noise -= lo
+    noise /= max(hi - lo, 1e-6)
+    return noise
+
+
+def _palette(colors: np.ndarray) -> np.ndarray:
+    """(256, 3) uint8 palette interpolated linearly between colors."""
+    stops = np.linspace(0, 255, len(colors))
+    return np.stack([np.interp(np.arange(256), stops, colors[:, c]) for c in range(3)], axis=1).astype(np.uint8)
+
+
+def _random_colors(rng: np.random.Generator, n: int, lo: int = 0, hi: int = 256) -> np.ndarray:
+    return rng.integers(lo, hi, (n, 3)).astype(np.float64)
+
+
+def _style_field(style: str, width: int, height: int, rng: np.random.Generator) -> tuple:
+    """(smooth float32 field in [0, 1] at width x height, palette) for one background style."""
+    if style == 'noise':
+        field = fractal_noise(width, height, rng, octaves=int(rng.integers(3, 6)), cells=int(rng.integers(2, 6)),
+                              persistence=float(rng.uniform(0.35, 0.65)))
+        return field, _palette(_random_colors(rng, int(rng.integers(2, 5))))
+    if style == 'gradient':
+        x = np.arange(width, dtype=np.float32)[None, :]
+        y = np.arange(height, dtype=np.float32)[:, None]
+        if rng.random() < 0.5:
+            angle = rng.uniform(0, 2 * np.pi)
+            field = x * np.float32(np.cos(angle)) + y * np.float32(np.sin(angle))  # linear
+        else:
+            dx, dy = x - np.float32(rng.uniform(0, width)), y - np.float32(rng.uniform(0, height))
+            field = np.sqrt(dx * dx + dy * dy)  # radial
+        field = (field - field.min()) / max(float(field.max() - field.min()), 1e-6)
+        field = 0.85 * field + 0.15 * fractal_noise(width, height, rng, octaves=3)
+        return field, _palette(_random_colors(rng, int(rng.integers(2, 4))))
+    if style == 'paper':
+        tint = rng.integers(215, 256, 3).astype(np.float64)
+        field = 0.5 + 0.35 * (fractal_noise(width, height, rng, octaves=5, cells=8, persistence=0.7) - 0.5)
+        return field, _palette(np.stack([tint * 0.82, tint * 0.93, tint]))
+    if style == 'fabric':
+        field = fractal_noise(width, height, rng, octaves=4, cells=6)
+        base = _random_colors(rng, 1, 30, 230)[0]
+        return field, _palette(np.stack([base * 0.55, base, np.minimum(base * 1.25, 255)]))
+    raise ValueError(f"Unknown background style: {style}")
+
+
+def _weave(width: int, height: int, period: float, levels: int) -> np.ndarray:
+    """Plain weave as uint8 in [0, levels]: warp and weft threads alternating over and under every period px."""
+    x = np.arange(width) * (np.pi / period)
+    y = np.arange(height) * (np.pi / period)
+    warp = (np.sin(x) ** 2 * levels).astype(np.uint8)[None, :]
+    weft = (np.sin(y) ** 2 * levels).astype(np.uint8)[:, None]
+    over = (np.floor(x / np.pi) % 2 == 1)[None, :] != (np.floor(y / np.pi) % 2 == 1)[:, None]
+    return np.where(over, warp, weft)
+
+
+def _add_text_clutter(canvas: np.ndarray, rng: np.random.Generator, blocks: int) -> None:
+    """Draw blocks of text-like glyph rows from a random 5x7 bitmap font into canvas in place."""
+    H, W = canvas.shape[:2]
+    font = rng.random((40, 7, 5)) < 0.45
+    font = np.pad(font, ((0, 1), (0, 1), (0, 1)))  # 1 px spacing; the last glyph is a blank space
+    for _ in range(blocks):
+        scale = int(rng.integers(1, max(2, min(W, H) // 200) + 2))
+        lines, chars = int(rng.integers(1, 12)), int(rng.integers(8, 60))
+        idx = rng.integers(0, 40, (lines, chars))
+        idx[rng.random((lines, chars)) < 0.18] = 40
+        gh, gw = 8 + int(rng.integers(0, 5)), 6  # glyph cell with line spacing
+        block = np.zeros((lines, gh, chars, gw), dtype=bool)
+        block[:, :8, :, :] = font[idx].transpose(0, 2, 1, 3)
+        mask = block.reshape(lines * gh, chars * gw).repeat(scale, 0).repeat(scale, 1)
+        y, x = int(rng.integers(-mask.shape[0] // 2, H)), int(rng.integers(-mask.shape[1] // 2, W))
+        y0, x0 = max(y, 0), max(x, 0)
+        y1, x1 = min(y + mask.shape[0], H), min(x + mask.shape[1], W)
+        if y1 <= y0 or x1 <= x0:
+            continue
+        ink = rng.integers(0, 256, 3) if rng.random() < 0.3 else rng.integers(0, 60, 3)
+        canvas[y0:y1, x0:x1][mask[y0 - y:y1 - y, x0 - x:x1 - x]] = ink.astype(np.uint8)
+
+
+def synthesize_background(width: int, height: int, rng: np.random.Generator, style: str = None, clutter: float = 0.5, grain: int = 4) -> np.ndarray:
+    """Procedural RGB uint8 background of exactly width x height, vectorized in NumPy.
+
+    ``style`` is one of ``BACKGROUND_STYLES`` (random if None): multi-octave
+    noise, linear or radial gradient, paper or woven fabric texture. With
+    probability ``clutter`` blocks of text-like glyph rows are drawn on top,
+    and sensor grain of about ±``grain`` levels is added. Smooth fields are
+    computed at reduced resolution, upsampled once as an 8-bit palette index
+    and coloured by a palette lookup, so no network, files or JPEG decoding
+    are involved.
+    """
+    if style is None:
+        style = BACKGROUND_STYLES[int(rng.integers(len(BACKGROUND_STYLES)))]
+    small_w, small_h = max(2, -(-width // FIELD_REDUCTION)), max(2, -(-height // FIELD_REDUCTION))
+    field, palette = _style_field(style, small_w, small_h, rng)
+
+    # Palette indices keep a margin of half the grain range, so adding grain cannot overflow
+    bits = max(1, int(np.log2(2 * grain))) if grain > 0 else 0
+    half = (1 << bits) // 2 if bits else 0
+    levels = 255 - 2 * half
+    if style == 'fabric':
+        field = field * (0.2 * levels)
     else:
-        urls = [f"https://picsum.photos/{img_size}/{img_size}?random={i}" for i in range(num_backgrounds)]
-
-    successful_downloads = 0
-    for i, url in enumerate(tqdm(urls, desc="Downloading backgrounds")):
-        try:
-            response = requests.get(url, timeout=15)
-            if response.status_code == 200:
-                filename = f"bg_{i:04d}.jpg"
-                filepath = os.path.join(backgrounds_dir, filename)
-                with open(filepath, "wb") as f:
-                    f.write(response.content)
-                successful_downloads += 1
-            else:
-                print(f"Failed to download {i}: HTTP {response.status_code}")
-        except Exception as e:
-            print(f"Error downloading {i}: {e}")
-
-    print(f"Downloaded {successful_downloads}/{num_backgrounds} backgrounds to {backgrounds_dir}")
-    print(f"Image size: {img_size}x{img_size}, Thematic: {thematic}")
\ No newline at end of file
+        field = field * levels + half
+    index = np.array(Image.fromarray(field.astype(np.uint8)).resize((width, height), Image.BILINEAR))
+    if style == 'fabric':
+        index += _weave(width, height, float(rng.uniform(4, 14)), round(0.45 * levels))
+        index += np.uint8(round(half + 0.35 * levels))
+    if bits:
+        index += np.frombuffer(rng.bytes(width * height), dtype=np.uint8).reshape(height, width) >> np.uint8(8 - bits)
+        index -= np.uint8(half)
+
+    img = Image.fromarray(index)
+    img.putpalette(palette.tobytes())
+    canvas = np.array(img.convert('RGB'))
+    if rng.random() < clutter:
+        _add_text_clutter(canvas, rng, int(rng.integers(1, 6)))
+    return canvas
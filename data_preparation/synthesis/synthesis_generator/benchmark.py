@@ -0,0 +1,196 @@
+import json
+import multiprocessing
+import platform
+import shutil
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from PIL import Image, ImageDraw
+import numpy as np
+from . import __version__
+from .background_utils import synthesize_background
+from .crop_utils import crop_logos
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Official logos shipped with the repo: data/tbank_official_logos
+OFFICIAL_LOGOS_DIR = Path(__file__).resolve().parents[3] / "data" / "tbank_official_logos"
+
+# Baseline case; every sweep varies one parameter from it
+BASE_CASE = {'N': 200, 'max_neg': 15, 'iou_threshold': 0.4, 'bg_size': 1280, 'max_logos': 10}
+
+DEFAULT_SWEEPS = {
+    'N': [100, 200, 400],
+    'max_neg': [0, 15, 30],
+    'iou_threshold': [0.1, 0.4, 0.7],
+    'bg_size': [640, 1280, 1920],
+    'max_logos': [1, 5, 10],
+}
+
+
+def procedural_distractor(size: int, rng: np.random.Generator) -> Image.Image:
+    """Random opaque RGBA emblem (polygon with an inner shape) on a transparent canvas."""
+    img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    n = int(rng.integers(3, 8))
+    angles = np.sort(rng.uniform(0, 2 * np.pi, n))
+    radius = size / 2 * rng.uniform(0.6, 1.0, n)
+    points = [(size / 2 + r * np.cos(a), size / 2 + r * np.sin(a)) for r, a in zip(radius, angles)]
+    draw.polygon(points, fill=tuple(int(c) for c in rng.integers(0, 256, 3)) + (255,))
+    inner = size // 4
+    draw.ellipse((inner, inner, size - inner, size - inner), fill=tuple(int(c) for c in rng.integers(0, 256, 3)) + (255,))
+    return img
+
+
+def make_fixture(fixture_dir: Path, bg_size: int = 1280, num_backgrounds: int = 20, num_distractors: int = 30, seed: int = 0, logos_dir: Path = None) -> dict:
+    """Create a self-contained fixture without downloads and return its directories.
+
+    Crops are cut from the official logos (``refs_ls_coco.json``), backgrounds
+    (``bg_size`` x ``bg_size * 3 // 4``) and distractors are generated
+    procedurally from ``seed``. Existing parts of the fixture are reused.
+    """
+    fixture_dir = Path(fixture_dir)
+    logos_dir = Path(logos_dir) if logos_dir else OFFICIAL_LOGOS_DIR
+    crops_dir = fixture_dir / "crops"
+    bg_dir = fixture_dir / f"backgrounds_{bg_size}"
+    objects_dir = fixture_dir / "background_objects"
+
+    if not any(crops_dir.glob("*.png")):
+        crop_logos(str(logos_dir / "refs_ls_coco.json"), str(logos_dir / "images"), str(crops_dir))
+
+    if not any(bg_dir.glob("*.jpg")):
+        bg_dir.mkdir(parents=True, exist_ok=True)
+        rng = np.random.default_rng([seed, bg_size])
+        for i in range(num_backgrounds):
+            Image.fromarray(synthesize_background(bg_size, bg_size * 3 // 4, rng)).save(bg_dir / f"bg_{i:04d}.jpg", quality=95)
+
+    if not any(objects_dir.glob("*.png")):
+        objects_dir.mkdir(parents=True, exist_ok=True)
+        rng = np.random.default_rng([seed, 1])
+        for i in range(num_distractors):
+            procedural_distractor(int(rng.integers(96, 256)), rng).save(objects_dir / f"obj_{i:04d}.png")
+
+    return {'crops_dir': crops_dir, 'bg_dir': bg_dir, 'bg_objects_dir': objects_dir}
+
+
+def _run_case_process(case: dict, fixture: dict, out_dir: str, kwargs: dict, queue) -> None:
+    """Generate one benchmark case in a fresh process and report time and peak RSS."""
+    from .generator import generate_synthetic_dataset
+
+    t0 = time.perf_counter()
+    generate_synthetic_dataset(
+        fixture['crops_dir'], fixture['bg_dir'], Path(out_dir), case['N'],
+        bg_objects_dir=fixture['bg_objects_dir'],
+        max_neg=case['max_neg'], iou_threshold=case['iou_threshold'], max_logos=case['max_logos'],
+        **kwargs
+    )
+    elapsed = time.perf_counter() - t0
+
+    peak_rss_mb = children_rss_mb = None
+    if resource is not None:
+        # ru_maxrss is in KB on Linux; children are the shard worker processes
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        children_rss_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    queue.put({'seconds': elapsed, 'peak_rss_mb': peak_rss_mb, 'peak_worker_rss_mb': children_rss_mb})
+
+
+def run_case(case: dict, fixture: dict, out_dir: Path, **kwargs) -> dict:
+    """Run one case in a spawned process, so peak RSS is measured per case."""
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run_case_process, args=(case, fixture, str(out_dir), kwargs, queue))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        raise RuntimeError(f"Benchmark case {case} failed with exit code {process.exitcode}")
+    result = queue.get()
+    result['images_per_sec'] = case['N'] / max(result['seconds'], 1e-9)
+    return {**case, **result}
+
+
+def build_cases(base: dict = None, sweeps: dict = None) -> list:
+    """Baseline case plus one-parameter-at-a-time variations, without duplicates."""
+    base = dict(base or BASE_CASE)
+    sweeps = DEFAULT_SWEEPS if sweeps is None else sweeps
+    cases = [base]
+    for param, values in sweeps.items():
+        for value in values:
+            case = {**base, param: value}
+            if case not in cases:
+                cases.append(case)
+    return cases
+
+
+def git_commit() -> str:
+    """Current git commit of the repo, or None outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=Path(__file__).parent, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(cases: list, fixture_dir: Path, work_dir: Path, seed: int = 0, repeats: int = 1, **kwargs) -> dict:
+    """Run all cases on the procedural fixture and return the JSON-ready report.
+
+    Each case is generated ``repeats`` times with the same ``seed``; the fastest
+    run is reported. Extra keyword arguments go to ``generate_synthetic_dataset``.
+    """
+    work_dir = Path(work_dir)
+    results = []
+    for case in cases:
+        fixture = make_fixture(fixture_dir, bg_size=case['bg_size'], seed=seed)
+        runs = []
+        for _ in range(repeats):
+            out_dir = work_dir / "out"
+            shutil.rmtree(out_dir, ignore_errors=True)
+            runs.append(run_case(case, fixture, out_dir, seed=seed, **kwargs))
+        best = max(runs, key=lambda run: run['images_per_sec'])
+        results.append(best)
+        print(f"{case}: {best['images_per_sec']:.2f} img/s, peak RSS {best['peak_rss_mb']} MB (workers {best['peak_worker_rss_mb']} MB)")
+    shutil.rmtree(work_dir / "out", ignore_errors=True)
+
+    return {
+        'generator_version': __version__,
+        'git_commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': multiprocessing.cpu_count(),
+        'seed': seed,
+        'options': {key: str(value) for key, value in kwargs.items()},
+        'results': results,
+    }
+
+
+def case_key(result: dict) -> tuple:
+    return tuple(result[param] for param in BASE_CASE)
+
+
+def compare_reports(old: dict, new: dict) -> list:
+    """Per-case images/sec and peak RSS ratios (new / old) for cases present in both reports."""
+    old_results = {case_key(result): result for result in old['results']}
+    rows = []
+    for result in new['results']:
+        previous = old_results.get(case_key(result))
+        if previous is None:
+            continue
+        rss_ratio = None
+        if result['peak_rss_mb'] and previous['peak_rss_mb']:
+            rss_ratio = result['peak_rss_mb'] / previous['peak_rss_mb']
+        rows.append({
+            **{param: result[param] for param in BASE_CASE},
+            'images_per_sec_old': previous['images_per_sec'],
+            'images_per_sec_new': result['images_per_sec'],
+            'speedup': result['images_per_sec'] / max(previous['images_per_sec'], 1e-9),
+            'rss_ratio': rss_ratio,
+        })
+    return rows
+
+
+def save_report(report: dict, path: Path) -> None:
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,197 @@
+from PIL import Image
+import numpy as np
+from .augmentations import get_background_aug_pipeline, get_neg_aug_pipeline, get_logo_aug_pipeline
+from .profiling import benchmark_pipelines, size_bucket
+
+# Transforms with smooth, shape-preserving output that may run at reduced resolution
+REDUCIBLE_TRANSFORMS = ('ElasticTransform', 'RandomShadow', 'Perspective', 'Rotate', 'ShiftScaleRotate', 'MotionBlur', 'GaussianBlur')
+
+# Share of the per-image budget for each pipeline
+DEFAULT_SHARES = {'background': 0.5, 'neg': 0.2, 'logo': 0.3}
+
+
+def load_transform_costs(stats: list) -> dict:
+    """Build a cost table {(pipeline, transform): {size bucket: mean ms per applied call}} from profile stats."""
+    costs = {}
+    for entry in stats:
+        table = costs.setdefault((entry['pipeline'], entry['transform']), {})
+        table[entry['size']] = entry['seconds'] / entry['calls'] * 1000
+    return costs
+
+
+def calibrate_transform_costs(sizes: tuple = (128, 256, 512, 1024, 2048), iterations: int = 5) -> dict:
+    """Measure per-transform costs with every transform applied on every call."""
+    return load_transform_costs(benchmark_pipelines(sizes, iterations, always_apply=True))
+
+
+def costs_to_stats(costs: dict) -> list:
+    """Inverse of load_transform_costs, for saving a cost table as JSON."""
+    return [
+        {'pipeline': pipeline, 'transform': transform, 'size': size, 'calls': 1, 'seconds': ms / 1000, 'max_seconds': ms / 1000}
+        for (pipeline, transform), table in costs.items()
+        for size, ms in table.items()
+    ]
+
+
+def estimate_cost(table: dict, side: int) -> float:
+    """Estimated ms for an input with longer side ``side``, scaled by area from the nearest measured bucket."""
+    if not table:
+        return 0.0
+    bucket = size_bucket((side,))
+    nearest = min(table, key=lambda size: abs(np.log2(size / bucket)))
+    return table[nearest] * (bucket / nearest) ** 2
+
+
+class AugmentationBudget:
+    """Per-image augmentation time budget split between pipelines.
+
+    ``start_image`` refills each pipeline's share of ``budget_ms``; budgeted
+    pipelines plan against what is left and debit their planned cost. Planning
+    uses estimated, not measured, time, so the same inputs always give the same
+    plan. What is left depends on the earlier calls of the image, so replaying
+    a single call needs its recorded plan (see ``BudgetedPipeline.last_plan``).
+    """
+
+    def __init__(self, budget_ms: float, shares: dict = None):
+        self.budget_ms = budget_ms
+        self.shares = shares or DEFAULT_SHARES
+        self.images = 0
+        self.skipped = {}
+        self.reduced = {}
+        self.remaining = {}
+        self.start_image()
+
+    def start_image(self) -> None:
+        self.remaining = {name: self.budget_ms * share for name, share in self.shares.items()}
+        self.images += 1
+
+    def available(self, name: str) -> float:
+        return self.remaining.get(name, 0.0)
+
+    def spend(self, name: str, ms: float) -> None:
+        self.remaining[name] = self.remaining.get(name, 0.0) - ms
+
+    def stats(self) -> dict:
+        return {'images': self.images, 'skipped': dict(self.skipped), 'reduced': dict(self.reduced)}
+
+
+def _apply_reduced(transform, image: np.ndarray, factor: int) -> np.ndarray:
+    """Apply transform at 1/factor resolution and upsample the result back."""
+    h, w = image.shape[:2]
+    small = np.asarray(Image.fromarray(image).resize((max(1, w // factor), max(1, h // factor)), Image.BILINEAR))
+    out = transform(image=small)['image']
+    return np.asarray(Image.fromarray(out).resize((w, h), Image.BILINEAR))
+
+
+def apply_plan(pipeline, factors: list = None, **data) -> dict:
+    """Run pipeline with per-transform factors: 0 skips, 1 runs at full resolution, n at 1/n.
+
+    Without ``factors`` the pipeline is called unchanged.
+    """
+    if factors is None:
+        return pipeline(**data)
+    for t, factor in zip(pipeline.transforms, factors):
+        if factor == 1:
+            data = t(**data)
+        elif factor > 1:
+            data['image'] = _apply_reduced(t, data['image'], factor)
+    return data
+
+
+class BudgetedPipeline:
+    """Cost-aware wrapper around an ``A.Compose`` that keeps worst-case time within a budget.
+
+    Before each call the transforms are planned for the input size as if all of
+    them fired. While the estimate exceeds the pipeline's remaining budget, the
+    most expensive transform is moved to half resolution (down to 1/4) if it is
+    in ``REDUCIBLE_TRANSFORMS``, otherwise skipped. Within budget the wrapped
+    pipeline is called unchanged. ``last_plan`` holds the per-transform factors
+    of the last call, or None if it ran unchanged; ``PlannedPipeline`` replays it.
+    """
+
+    def __init__(self, pipeline, name: str, costs: dict, budget: AugmentationBudget, max_factor: int = 4):
+        self.pipeline = pipeline
+        self.name = name
+        self.costs = costs
+        self.budget = budget
+        self.max_factor = max_factor
+        self.last_plan = None
+
+    @property
+    def transforms(self):
+        return self.pipeline.transforms
+
+    def set_random_seed(self, seed: int) -> None:
+        if hasattr(self.pipeline, 'set_random_seed'):
+            self.pipeline.set_random_seed(seed)
+
+    def plan(self, shape: tuple, budget_ms: float) -> list:
+        """Return [transform name, factor, estimated ms] per transform; factor 0 skips, 1 is full resolution."""
+        side = max(shape[:2])
+        plan = []
+        for t in self.transforms:
+            name = type(t).__name__
+            name = name[len('Profiled'):] if name.startswith('Profiled') else name
+            plan.append([name, 1, estimate_cost(self.costs.get((self.name, name), {}), side)])
+
+        total = sum(entry[2] for entry in plan)
+        while total > budget_ms:
+            entry = max((entry for entry in plan if entry[1] > 0), key=lambda entry: entry[2], default=None)
+            if entry is None or entry[2] <= 0:
+                break
+            name, factor, cost = entry
+            if name in REDUCIBLE_TRANSFORMS and factor < self.max_factor:
+                entry[1] = factor * 2
+                entry[2] = estimate_cost(self.costs.get((self.name, name), {}), max(1, side // entry[1]))
+            else:
+                entry[1] = 0
+                entry[2] = 0.0
+            total = sum(entry[2] for entry in plan)
+        return plan
+
+    def __call__(self, **data) -> dict:
+        plan = self.plan(data['image'].shape, self.budget.available(self.name))
+        self.budget.spend(self.name, sum(entry[2] for entry in plan))
+        factors = [factor for _, factor, _ in plan]
+        self.last_plan = None if all(factor == 1 for factor in factors) else factors
+        for name, factor, _ in plan:
+            if factor == 0:
+                self.budget.skipped[name] = self.budget.skipped.get(name, 0) + 1
+            elif factor > 1:
+                self.budget.reduced[name] = self.budget.reduced.get(name, 0) + 1
+        return apply_plan(self.pipeline, self.last_plan, **data)
+
+
+class PlannedPipeline:
+    """Pipeline with a fixed plan recorded from ``BudgetedPipeline.last_plan``, for exact replay of a budgeted call."""
+
+    def __init__(self, pipeline, factors: list):
+        self.pipeline = pipeline
+        self.factors = factors
+
+    @property
+    def transforms(self):
+        return self.pipeline.transforms
+
+    def set_random_seed(self, seed: int) -> None:
+        if hasattr(self.pipeline, 'set_random_seed'):
+            self.pipeline.set_random_seed(seed)
+
+    def __call__(self, **data) -> dict:
+        return apply_plan(self.pipeline, self.factors, **data)
+
+
+def replay_pipeline(pipeline, factors: list = None):
+    """Pipeline that repeats a recorded budgeted call: ``pipeline`` itself if the call ran unchanged."""
+    return pipeline if factors is None else PlannedPipeline(pipeline, factors)
+
+
+def get_budgeted_pipelines(budget_ms: float, costs: dict, shares: dict = None) -> tuple:
+    """Return (budget, background, neg, logo) budgeted pipelines sharing one per-image budget."""
+    budget = AugmentationBudget(budget_ms, shares)
+    return (
+        budget,
+        BudgetedPipeline(get_background_aug_pipeline(), 'background', costs, budget),
+        BudgetedPipeline(get_neg_aug_pipeline(), 'neg', costs, budget),
+        BudgetedPipeline(get_logo_aug_pipeline(), 'logo', costs, budget),
+    )
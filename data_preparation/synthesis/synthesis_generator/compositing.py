@@ -0,0 +1,47 @@
+from PIL import Image
+import numpy as np
+
+
+def canvas_size(canvas) -> tuple:
+    """Return (W, H) of a PIL image or an (H, W, C) uint8 canvas."""
+    if isinstance(canvas, np.ndarray):
+        return canvas.shape[1], canvas.shape[0]
+    return canvas.size
+
+
+def alpha_blend(canvas: np.ndarray, sprite: np.ndarray, x: int, y: int) -> np.ndarray:
+    """Alpha-blend an RGBA sprite into an RGB uint8 canvas in place at (x, y).
+
+    Only the overlapping region is touched; parts of the sprite outside the
+    canvas are clipped.
+    """
+    h, w = sprite.shape[:2]
+    H, W = canvas.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, W), min(y + h, H)
+    if x1 <= x0 or y1 <= y0:
+        return canvas
+
+    src = sprite[y0 - y:y1 - y, x0 - x:x1 - x]
+    dst = canvas[y0:y1, x0:x1]
+    alpha = src[..., 3:4].astype(np.uint16)
+    blended = (src[..., :3] * alpha + dst * (255 - alpha) + 127) // 255
+    dst[...] = blended
+    return canvas
+
+
+def paste_sprite(canvas, sprite, x: int, y: int):
+    """Paste an RGBA sprite (PIL image or array) onto a PIL image or NumPy canvas."""
+    if isinstance(canvas, np.ndarray):
+        return alpha_blend(canvas, np.asarray(sprite), x, y)
+    if isinstance(sprite, np.ndarray):
+        sprite = Image.fromarray(sprite)
+    canvas.paste(sprite, (x, y), sprite)
+    return canvas
+
+
+def to_image(canvas) -> Image.Image:
+    """Convert a NumPy canvas to a PIL image for encoding."""
+    if isinstance(canvas, np.ndarray):
+        return Image.fromarray(canvas)
+    return canvas
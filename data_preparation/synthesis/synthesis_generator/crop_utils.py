@@ -1,8 +1,18 @@
 import os
 import json
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image
 from pathlib import Path
 
+# Progress is printed every this many images
+PROGRESS_EVERY = 1000
+
+# With workers=None a process is started per this many images at most;
+# small sets (e.g. the 9 reference images) are cropped in this process
+MIN_IMAGES_PER_WORKER = 16
+
 
 def load_coco_annotations(coco_path: str) -> dict:
     """Load COCO annotations from JSON file."""
@@ -10,38 +20,99 @@ def load_coco_annotations(coco_path: str) -> dict:
         return json.load(f)
 
 
-def crop_logos_from_annotations(coco: dict, images_dir: str, crops_dir: str) -> None:
-    """Crop logos from images based on COCO annotations."""
-    os.makedirs(crops_dir, exist_ok=True)
+def resolve_image_path(images_dir: str, file_name: str) -> Path:
+    """Image path for a COCO file_name: relative to images_dir, else its base name in images_dir."""
+    img_path = Path(images_dir) / file_name
+    if img_path.exists():
+        return img_path
+    return Path(images_dir) / Path(file_name).name
 
+
+def plan_crops(coco: dict) -> list:
+    """Group annotations by image into (image info, [(crop name, bbox)]) tasks.
+
+    Crops are named ``{category}_{image_id:02d}.png``; when an image has
+    several boxes of one category the annotation id is appended so crops do
+    not overwrite each other. Degenerate boxes and annotations of unknown
+    images are skipped.
+    """
     img_dict = {img['id']: img for img in coco['images']}
-    category_map = {cat['id']: cat['name'] for cat in coco['categories']}
+    category_map = {cat['id']: cat['name'].replace('_', '') for cat in coco['categories']}
 
+    by_image = defaultdict(list)
     for ann in coco['annotations']:
-        img_id = ann['image_id']
-        img_info = img_dict[img_id]
-        file_name = img_info['file_name']
-        img_path = Path(images_dir) / Path(file_name).name
-        if not img_path.exists():
-            print(f"Image not found: {img_path}")
-            continue
+        if ann['image_id'] in img_dict and ann['bbox'][2] >= 1 and ann['bbox'][3] >= 1:
+            by_image[ann['image_id']].append(ann)
+
+    tasks = []
+    for img_id, anns in by_image.items():
+        per_category = Counter(ann['category_id'] for ann in anns)
+        crops = []
+        for ann in anns:
+            name = f"{category_map[ann['category_id']]}_{img_id:02d}"
+            if per_category[ann['category_id']] > 1:
+                name += f"_{ann['id']}"
+            crops.append((name + ".png", tuple(ann['bbox'])))
+        tasks.append((img_dict[img_id], crops))
+    return tasks
+
+
+def _crop_image(task: tuple) -> int:
+    """Decode one image once and save all of its crops; returns the crop count or -1 if missing."""
+    img_path, crops, crops_dir = task
+    if not img_path.exists():
+        return -1
+    with Image.open(img_path) as src:
+        img = src.convert("RGBA")
+    for crop_name, (x, y, w, h) in crops:
+        img.crop((x, y, x + w, y + h)).save(Path(crops_dir) / crop_name)
+    return len(crops)
+
+
+def crop_logos_from_annotations(coco: dict, images_dir: str, crops_dir: str, workers: int = None) -> dict:
+    """Crop logos from images based on COCO annotations.
+
+    Annotations are grouped by image, so every source image is decoded once
+    and all of its crops are cut from it; images are spread over ``workers``
+    processes. By default one per CPU, but no more than one per
+    ``MIN_IMAGES_PER_WORKER`` images, so small sets stay in this process;
+    1 always crops in this process. Returns counts of images, crops and
+    missing images.
+    """
+    os.makedirs(crops_dir, exist_ok=True)
+    tasks = [(resolve_image_path(images_dir, img_info['file_name']), crops, str(crops_dir))
+             for img_info, crops in plan_crops(coco)]
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(tasks) // MIN_IMAGES_PER_WORKER)
+    workers = max(1, min(workers, len(tasks)))
 
-        x, y, w, h = ann['bbox']
-        category_id = ann['category_id']
-        category_name = category_map[category_id]
+    t0 = time.perf_counter()
+    stats = {'images': 0, 'crops': 0, 'missing': 0}
 
-        img = Image.open(img_path).convert("RGBA")
-        crop = img.crop((x, y, x + w, y + h))
+    def collect(results):
+        for (img_path, _, _), n_crops in zip(tasks, results):
+            if n_crops < 0:
+                stats['missing'] += 1
+                print(f"Image not found: {img_path}")
+                continue
+            stats['images'] += 1
+            stats['crops'] += n_crops
+            if stats['images'] % PROGRESS_EVERY == 0:
+                print(f"Cropped {stats['crops']} logos from {stats['images']}/{len(tasks)} images")
 
-        crop_name = f"{category_name.replace('_', '')}_{img_id:02d}.png"
-        crop_path = Path(crops_dir) / crop_name
-        crop.save(crop_path)
-        print(f"Cropped {crop_name} from {file_name}")
+    if workers == 1:
+        collect(map(_crop_image, tasks))
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            collect(executor.map(_crop_image, tasks, chunksize=max(1, min(64, len(tasks) // (workers * 8)))))
 
-    print("Cropping completed.")
+    elapsed = time.perf_counter() - t0
+    print(f"Cropping completed: {stats['crops']} crops from {stats['images']} images "
+          f"({stats['missing']} missing) in {elapsed:.1f}s with {workers} worker(s)")
+    return stats
 
 
-def crop_logos(coco_path: str, images_dir: str, crops_dir: str) -> None:
+def crop_logos(coco_path: str, images_dir: str, crops_dir: str, workers: int = None) -> dict:
     """Main function to crop logos from COCO annotations."""
     coco = load_coco_annotations(coco_path)
-    crop_logos_from_annotations(coco, images_dir, crops_dir)
\ No newline at end of file
+    return crop_logos_from_annotations(coco, images_dir, crops_dir, workers)
@@ -0,0 +1,250 @@
+import io
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from PIL import Image
+import numpy as np
+
+HASH_METHODS = ('dhash', 'phash')
+HASH_BITS = 64
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# Per-directory cache of file hashes per method, refreshed for new or changed files only
+HASH_CACHE = ".image_hashes_{method}.npz"
+
+# find_duplicates pairs band buckets up to this size (or 4x the expected size on big pools);
+# larger buckets, e.g. clusters of near-identical images, are checked against their kept names only
+MAX_BUCKET = 64
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    return np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n))
+
+
+_DCT32 = _dct_matrix(32)
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), 'big')
+
+
+def image_hash(source, method: str = 'dhash') -> int:
+    """64-bit perceptual hash of an image path, bytes or PIL image.
+
+    'dhash' compares neighbouring pixels of a 9x8 grayscale thumbnail;
+    'phash' thresholds the 8x8 lowest DCT frequencies of a 32x32 thumbnail
+    at their median. JPEGs are decoded at reduced size (``Image.draft``).
+    """
+    if method not in HASH_METHODS:
+        raise ValueError(f"Unknown hash method: {method}")
+    img = source if isinstance(source, Image.Image) else Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+    img.draft('L', (64, 64))
+    gray = img.convert('L')
+    if method == 'dhash':
+        px = np.asarray(gray.resize((9, 8), Image.BOX), dtype=np.int16)
+        return _bits_to_int(px[:, 1:] > px[:, :-1])
+    px = np.asarray(gray.resize((32, 32), Image.BOX), dtype=np.float64)
+    low = (_DCT32 @ px @ _DCT32.T)[:8, :8]
+    return _bits_to_int(low > np.median(low.ravel()[1:]))
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class HashIndex:
+    """Multi-index hashing over 64-bit perceptual hashes for near-duplicate lookup.
+
+    Hashes are split into ``threshold + 1`` bands, each with its own exact
+    lookup table; by the pigeonhole principle two hashes within ``threshold``
+    bits share at least one band, so a query checks only the few hashes
+    sharing a band instead of the whole pool. ``add_if_new`` is thread-safe.
+    """
+
+    def __init__(self, threshold: int = 4):
+        self.threshold = threshold
+        bands = threshold + 1
+        widths = [HASH_BITS // bands + (i < HASH_BITS % bands) for i in range(bands)]
+        self._bands = [(sum(widths[:i]), (1 << width) - 1) for i, width in enumerate(widths)]
+        self._tables = [{} for _ in range(bands)]
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, key) -> bool:
+        return key in self._hashes
+
+    def add(self, key, h: int) -> None:
+        if key in self._hashes:
+            self.remove(key)
+        self._hashes[key] = h
+        for table, (shift, mask) in zip(self._tables, self._bands):
+            table.setdefault((h >> shift) & mask, []).append(key)
+
+    def remove(self, key) -> None:
+        h = self._hashes.pop(key)
+        for table, (shift, mask) in zip(self._tables, self._bands):
+            table[(h >> shift) & mask].remove(key)
+
+    def query(self, h: int) -> list:
+        """(distance, key) of all hashes within threshold bits of h, nearest first."""
+        candidates = set()
+        for table, (shift, mask) in zip(self._tables, self._bands):
+            candidates.update(table.get((h >> shift) & mask, ()))
+        matches = [(hamming(h, self._hashes[key]), key) for key in candidates]
+        return sorted(match for match in matches if match[0] <= self.threshold)
+
+    def find(self, h: int):
+        """Key of the nearest near-duplicate of h, or None."""
+        matches = self.query(h)
+        return matches[0][1] if matches else None
+
+    def add_if_new(self, key, h: int):
+        """Atomically add h unless it is a near-duplicate; returns the duplicate's key or None."""
+        with self._lock:
+            duplicate = self.find(h)
+            if duplicate is None:
+                self.add(key, h)
+            return duplicate
+
+
+def _load_cache(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with np.load(path) as data:
+        return {name: (int(h), int(size), float(mtime))
+                for name, h, size, mtime in zip(data['names'].tolist(), data['hashes'], data['sizes'], data['mtimes'])}
+
+
+def _save_cache(path: Path, entries: dict) -> None:
+    names = sorted(entries)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'wb') as f:
+        np.savez(f, names=np.array(names, dtype=str).reshape(-1),
+                 hashes=np.array([entries[name][0] for name in names], dtype=np.uint64),
+                 sizes=np.array([entries[name][1] for name in names], dtype=np.int64),
+                 mtimes=np.array([entries[name][2] for name in names], dtype=np.float64))
+    os.replace(tmp, path)
+
+
+def hash_directory(directory: Path, method: str = 'dhash', threads: int = None, persist: bool = True) -> dict:
+    """{file name: hash} for the images in a directory.
+
+    Hashes are cached in ``HASH_CACHE`` inside the directory and recomputed
+    only for new or modified files, so repeated scans of a large pool cost a
+    stat per file. Unreadable images are skipped.
+    """
+    directory = Path(directory)
+    cache_path = directory / HASH_CACHE.format(method=method)
+    cached = _load_cache(cache_path)
+
+    entries, todo = {}, []
+    for path in sorted(directory.iterdir()):
+        if path.suffix.lower() not in IMAGE_EXTENSIONS:
+            continue
+        st = path.stat()
+        entry = cached.get(path.name)
+        if entry is not None and entry[1] == st.st_size and entry[2] == st.st_mtime:
+            entries[path.name] = entry
+        else:
+            todo.append((path, st))
+
+    def compute(item):
+        path, st = item
+        try:
+            return path.name, (image_hash(path, method), st.st_size, st.st_mtime)
+        except Exception as e:
+            print(f"Cannot hash {path}: {e}")
+            return path.name, None
+
+    with ThreadPoolExecutor(threads) as executor:
+        for name, entry in executor.map(compute, todo):
+            if entry is not None:
+                entries[name] = entry
+
+    if persist and (todo or entries.keys() != cached.keys()):
+        _save_cache(cache_path, entries)
+    return {name: entry[0] for name, entry in entries.items()}
+
+
+def _popcount(x: np.ndarray) -> np.ndarray:
+    if hasattr(np, 'bitwise_count'):  # NumPy 2.0+
+        return np.bitwise_count(x)
+    return _BYTE_POPCOUNT[x.view(np.uint8)].reshape(len(x), 8).sum(axis=1)
+
+
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def find_duplicates(hashes: dict, threshold: int = 4) -> list:
+    """(duplicate, kept, distance) triples; of each near-duplicate group the first name in sorted order is kept.
+
+    A name is a duplicate when it is within ``threshold`` bits of an earlier
+    kept name. Candidate pairs come from the same bands as ``HashIndex``,
+    grouped with NumPy sorts, so the check is vectorized over the whole pool.
+    Buckets above ``MAX_BUCKET`` are not paired: their members are compared
+    with the bucket's kept names in name order, like ``HashIndex.add_if_new``.
+    """
+    names = sorted(hashes)
+    h = np.array([hashes[name] for name in names], dtype=np.uint64)
+    n = len(names)
+    keys = [np.zeros(0, dtype=np.int64)]
+    big_buckets = defaultdict(list)
+    n_big = 0
+    for shift, mask in HashIndex(threshold)._bands:
+        band = (h >> np.uint64(shift)) & np.uint64(mask)
+        order = np.argsort(band, kind='stable')
+        band = band[order]
+        _, starts, counts = np.unique(band, return_index=True, return_counts=True)
+        oversized = counts > max(MAX_BUCKET, 4 * -(-n // (mask + 1)))
+        for start, count in zip(starts[oversized].tolist(), counts[oversized].tolist()):
+            for j in order[start:start + count].tolist():
+                big_buckets[j].append(n_big)
+            n_big += 1
+        small = ~np.repeat(oversized, counts)
+        order, band = order[small], band[small]
+        # Equal band values are adjacent after sorting: pair every element with the next k-th one until no bucket is that large
+        for k in range(1, len(band)):
+            same = band[k:] == band[:-k]
+            if not same.any():
+                break
+            a, b = order[:-k][same], order[k:][same]
+            near = _popcount(h[a] ^ h[b]) <= threshold
+            keys.append(np.minimum(a, b)[near] * n + np.maximum(a, b)[near])
+    keys = np.unique(np.concatenate(keys))
+    first, second = keys // n, keys % n
+    dist = _popcount(h[first] ^ h[second])
+    pairs = defaultdict(list)
+    for i, j, d in zip(first.tolist(), second.tolist(), dist.tolist()):
+        pairs[j].append((d, i))
+
+    # Resolve in name order: a name is a duplicate of its nearest earlier kept name
+    duplicate_of = {}
+    kept_in = defaultdict(list)
+    for j in sorted(pairs.keys() | big_buckets.keys()):
+        matches = [(d, i) for d, i in pairs.get(j, ()) if i not in duplicate_of]
+        for bucket in big_buckets.get(j, ()):
+            kept = np.array(kept_in[bucket], dtype=np.int64)
+            d = _popcount(h[kept] ^ h[j])
+            matches += zip(d[d <= threshold].tolist(), kept[d <= threshold].tolist())
+        if matches:
+            d, i = min(matches)
+            duplicate_of[j] = (i, d)
+        else:
+            for bucket in big_buckets.get(j, ()):
+                kept_in[bucket].append(j)
+    return [(names[j], names[i], d) for j, (i, d) in sorted(duplicate_of.items())]
+
+
+def build_hash_index(directory: Path, method: str = 'dhash', threshold: int = 4, threads: int = None) -> HashIndex:
+    """HashIndex over the images of a directory, e.g. to reject duplicates while downloading into it."""
+    index = HashIndex(threshold)
+    if Path(directory).exists():
+        for name, h in hash_directory(directory, method, threads).items():
+            index.add(name, h)
+    return index
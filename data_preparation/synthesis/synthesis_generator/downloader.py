@@ -0,0 +1,130 @@
+import io
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from PIL import Image
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+
+# Responses worth retrying; other HTTP errors fail the job immediately
+RETRY_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+
+# Transport errors worth retrying: connection failures, timeouts and bodies cut
+# short (fewer bytes than Content-Length) or undecodable
+RETRY_ERRORS = (requests.ConnectionError, requests.Timeout,
+                requests.exceptions.ChunkedEncodingError, requests.exceptions.ContentDecodingError)
+
+
+def is_valid_image(source) -> bool:
+    """Whether a path or bytes hold a complete, decodable image (header and data checked)."""
+    try:
+        with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as img:
+            img.load()
+        return True
+    except Exception:
+        return False
+
+
+def make_session(max_in_flight: int = 16) -> requests.Session:
+    """Session whose connection pool holds one keep-alive connection per in-flight request."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_in_flight, pool_maxsize=max_in_flight, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _retry_delay(attempt: int, backoff: float, response=None) -> float:
+    """Exponential backoff with jitter, or the server's Retry-After when it gives seconds."""
+    if response is not None:
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return float(retry_after)
+    return backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+
+
+def fetch(session: requests.Session, url: str, timeout: float = 15, retries: int = 4, backoff: float = 0.5, verify=is_valid_image) -> tuple:
+    """GET url with retries; returns (content, attempts) or raises the last error.
+
+    Errors in ``RETRY_ERRORS`` (including truncated bodies), retryable statuses
+    and content rejected by ``verify`` (e.g. truncated images) are retried up
+    to ``retries`` times.
+    """
+    for attempt in range(retries + 1):
+        response = None
+        try:
+            response = session.get(url, timeout=timeout)
+            if response.status_code == 200:
+                if verify is None or verify(response.content):
+                    return response.content, attempt + 1
+                error = ValueError(f"Invalid content from {url}")
+            elif response.status_code in RETRY_STATUSES:
+                error = requests.HTTPError(f"HTTP {response.status_code}")
+            else:
+                raise requests.HTTPError(f"HTTP {response.status_code}")
+        except RETRY_ERRORS as e:
+            error = e
+        if attempt < retries:
+            time.sleep(_retry_delay(attempt, backoff, response))
+    raise error
+
+
+def download_files(jobs: list, max_in_flight: int = 16, timeout: float = 15, retries: int = 4, backoff: float = 0.5,
+                   verify=is_valid_image, session: requests.Session = None, desc: str = "Downloading", accept=None) -> dict:
+    """Download (url, path) jobs concurrently over one pooled session.
+
+    At most ``max_in_flight`` requests run at once. Files already on disk that
+    pass ``verify`` are skipped, so an interrupted run resumes where it
+    stopped; corrupt leftovers are downloaded again. Files are written to a
+    temporary name and renamed, so a crash never leaves a partial file under
+    the final name. ``accept(path, content)`` can reject downloaded content,
+    e.g. near-duplicates, which is then not written. Returns counts of
+    downloaded, skipped, rejected and failed jobs, retries, bytes and wall time.
+    """
+    stats = {'downloaded': 0, 'skipped': 0, 'rejected': 0, 'failed': 0, 'retries': 0, 'bytes': 0}
+    pending = []
+    for url, path in jobs:
+        if Path(path).exists() and (verify is None or verify(Path(path))):
+            stats['skipped'] += 1
+        else:
+            pending.append((url, Path(path)))
+
+    own_session = session is None
+    session = session or make_session(max_in_flight)
+    lock = threading.Lock()
+
+    def download(url, path):
+        content, attempts = fetch(session, url, timeout, retries, backoff, verify)
+        if accept is not None and not accept(path, content):
+            with lock:
+                stats['rejected'] += 1
+                stats['retries'] += attempts - 1
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".part")
+        tmp.write_bytes(content)
+        os.replace(tmp, path)
+        with lock:
+            stats['downloaded'] += 1
+            stats['retries'] += attempts - 1
+            stats['bytes'] += len(content)
+
+    t0 = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_in_flight) as executor:
+            futures = {executor.submit(download, url, path): url for url, path in pending}
+            for future in tqdm(as_completed(futures), total=len(futures), desc=desc):
+                try:
+                    future.result()
+                except Exception as e:
+                    stats['failed'] += 1
+                    print(f"Failed to download {futures[future]}: {e}")
+    finally:
+        if own_session:
+            session.close()
+    stats['seconds'] = time.perf_counter() - t0
+    return stats
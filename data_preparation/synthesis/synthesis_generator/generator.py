@@ -1,10 +1,32 @@
 import os
 import random
 import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from PIL import Image
 import numpy as np
-from .augmentations import get_augmentation_pipeline, get_background_aug_pipeline, get_neg_aug_pipeline, get_logo_aug_pipeline
+from tqdm import tqdm
+from .asset_cache import AssetCache
+from .background_cache import BackgroundCache
+from .background_utils import synthesize_background
+from .manifest import (
+    add_batch, check_params, dataset_summary, load_manifest, mark_shard_done,
+    new_manifest, pending_shards, save_manifest, total_images
+)
+from .compositing import canvas_size, paste_sprite
+from .label_index import INDEX_NAME, build_index, index_dataset, load_index, merge_indexes, save_index
+from .budget import calibrate_transform_costs, costs_to_stats, get_budgeted_pipelines, load_transform_costs
+from .profiling import TransformProfiler, format_profile_table, merge_profiles
+from .scheduler import balanced_targets, plan_class_composition, plan_totals
+from .shards import ShardWriter
+from .resize import resize_image, validate_resize_backend
+from .shared_pool import SharedAssetPool
+from .sprite_atlas import SpriteAtlas
+from .telemetry import format_stage_table, stage_timer, summarize_stages, timed, write_prometheus, write_trace
+from .writer import AsyncWriter, encode_jpeg, select_jpeg_backend, write_sample
+from .placement import OccupancyGrid, find_placement, find_placement_grid
+from .augmentations import apply_seeded_pipeline, get_augmentation_pipeline, get_background_aug_pipeline, get_neg_aug_pipeline, get_logo_aug_pipeline
 
 
 def calculate_iou(bbox1: tuple, bbox2: tuple) -> float:
@@ -76,120 +98,157 @@ def load_backgrounds(bg_dir: Path) -> list:
     return [str(f) for f in bg_dir.glob("*.jpg")]
 
 
-def place_distractors(bg: Image.Image, bg_objects: list, neg_aug_pipeline, max_neg: int = 15) -> Image.Image:
-    """Place distractor objects on background without labels."""
+def load_rgba(path: str, asset_cache: AssetCache = None) -> Image.Image:
+    """Load RGBA asset, from the decoded asset cache when given."""
+    if asset_cache is not None:
+        return asset_cache.get_image(path)
+    return Image.open(path).convert("RGBA")
+
+
+def _record_plan(item: dict, pipeline) -> None:
+    """Add the plan of the last budgeted pipeline call to a recipe item, if it was not run unchanged."""
+    plan = getattr(pipeline, 'last_plan', None)
+    if plan is not None:
+        item['aug_plan'] = plan
+
+
+def place_distractors(bg, bg_objects: list, neg_aug_pipeline, max_neg: int = 15, asset_cache: AssetCache = None, recipe_items: list = None, sprite_atlas: SpriteAtlas = None, resize_backend: str = 'lanczos'):
+    """Place distractor objects on background (PIL image or uint8 canvas) without labels.
+
+    If ``recipe_items`` is given, a replayable record of every placed distractor is appended to it.
+    With ``sprite_atlas`` pre-rendered sprites of the nearest size and angle are used
+    instead of resizing and rotating at runtime; otherwise sprites are resized
+    with ``resize_backend`` (see ``resize.resize_image``).
+    """
     if not bg_objects:
         return bg
 
-    W, H = bg.size
+    W, H = canvas_size(bg)
     num_neg = random.randint(0, max_neg)
     placed_positions = []
 
     for _ in range(num_neg):
         obj_path = random.choice(bg_objects)
-        obj = Image.open(obj_path).convert("RGBA")
-
-        # Random augment distractor
-        obj_arr = np.array(obj)
-        auged_obj = neg_aug_pipeline(image=obj_arr)['image']
-        obj = Image.fromarray(auged_obj)
+        aug_seed = random.randrange(2**32)
 
         # Random scale and rotate
         scale = random.uniform(0.05, 0.2)
         nw = int(W * scale)
-        nh = int(obj.height * scale)
-        obj_t = obj.resize((nw, nh), Image.LANCZOS).rotate(random.uniform(-45, 45), expand=True)
-
-        # Random position
-        attempts = 0
-        while attempts < 5:
-            x = random.randint(0, max(0, W - obj_t.width))
-            y = random.randint(0, max(0, H - obj_t.height))
-
-            # Check IoU with existing distractors (loose check)
-            current_bbox = (x/W, y/H, obj_t.width/W, obj_t.height/H)
-            overlap = False
-            for prev_bbox in placed_positions:
-                if calculate_iou(current_bbox, prev_bbox) > 0.5:
-                    overlap = True
-                    break
-
-            if not overlap:
-                placed_positions.append(current_bbox)
-                bg.paste(obj_t, (x, y), obj_t)
-                break
-            attempts += 1
+        angle = random.uniform(-45, 45)
+
+        sprite = None
+        aug_item = {}
+        if sprite_atlas is not None:
+            sprite, entry = sprite_atlas.sample(obj_path, nw, angle)
+        if sprite is not None:
+            obj_t = sprite
+            if sprite_atlas.variants(obj_path) == 1:
+                obj_t = apply_seeded_pipeline(neg_aug_pipeline, aug_seed, image=np.array(sprite))['image']
+                _record_plan(aug_item, neg_aug_pipeline)
+            nw, nh, angle = entry['width'], entry['height'], entry['angle']
+        else:
+            # Random augment distractor
+            obj_arr = np.array(load_rgba(obj_path, asset_cache))
+            auged_obj = apply_seeded_pipeline(neg_aug_pipeline, aug_seed, image=obj_arr)['image']
+            _record_plan(aug_item, neg_aug_pipeline)
+            obj = Image.fromarray(auged_obj)
+            nh = int(obj.height * scale)
+            obj_t = resize_image(obj, (nw, nh), resize_backend).rotate(angle, expand=True)
+        obj_w, obj_h = canvas_size(obj_t)
+
+        # Random position, loose IoU check with existing distractors
+        placement = find_placement(W, H, obj_w, obj_h, placed_positions,
+                                   iou_threshold=0.5, min_visibility=0.0, num_candidates=5)
+        if placement is not None:
+            x, y, current_bbox = placement
+            placed_positions.append(current_bbox)
+            paste_sprite(bg, obj_t, x, y)
+            if recipe_items is not None:
+                recipe_items.append({'path': obj_path, 'aug_seed': aug_seed, 'w': nw / W, 'h': nh / H,
+                                     'angle': angle, 'x': x / W, 'y': y / H, **aug_item})
 
     return bg
 
 
-def place_multi_logos(bg: Image.Image, crops_by_class: dict, logo_aug_pipeline, iou_threshold: float = 0.4, max_logos: int = 10) -> tuple:
-    """Place multiple logos on background with IoU control."""
-    W, H = bg.size
-    num_logos = random.randint(1, max_logos)
+def place_multi_logos(bg, crops_by_class: dict, logo_aug_pipeline, iou_threshold: float = 0.4, max_logos: int = 10, asset_cache: AssetCache = None, placement_mode: str = 'random', stats: dict = None, recipe_items: list = None, planned_classes: list = None, sprite_atlas: SpriteAtlas = None, resize_backend: str = 'lanczos') -> tuple:
+    """Place multiple logos on background (PIL image or uint8 canvas) with IoU control.
+
+    ``placement_mode='random'`` uses rejection sampling, ``'grid'`` samples only
+    from free positions of an occupancy grid. If ``stats`` is given it is filled
+    with requested/placed logo counts and placement attempts used. If
+    ``recipe_items`` is given, a replayable record of every placed logo is appended to it.
+    With ``planned_classes`` exactly these logo classes are placed, one per slot,
+    instead of a random number of random classes. With ``sprite_atlas`` logos
+    come pre-resized and pre-rotated from the atlas, and augmentation is skipped
+    when the atlas stores photometric variants. Runtime resizes use ``resize_backend``.
+    """
+    W, H = canvas_size(bg)
+    num_logos = len(planned_classes) if planned_classes is not None else random.randint(1, max_logos)
     placed_bboxes = []
     bboxes_info = []
+    attempts = 0
+    grid = OccupancyGrid(W, H) if placement_mode == 'grid' else None
 
-    for _ in range(num_logos):
-        attempts = 0
+    for slot in range(num_logos):
         max_placement_attempts = 5
 
-        while attempts < max_placement_attempts:
+        for _ in range(max_placement_attempts):
             # Choose class and crop
-            cls = random.choice([0, 1, 2])
+            cls = planned_classes[slot] if planned_classes is not None else random.choice([0, 1, 2])
             crop_path = random.choice(crops_by_class[cls])
 
-            ref = Image.open(crop_path).convert("RGBA")
-
             # Random scale and rotate
             scale = random.uniform(0.15, 0.45)
             nw = int(W * scale)
-            nh = int(ref.height * scale)
-            ref_t = ref.resize((nw, nh), Image.LANCZOS).rotate(random.uniform(-25, 25), expand=True)
-
-            # Random position with clipping control
-            pos_attempts = 0
-            while pos_attempts < 10:
-                x = random.randint(0, max(0, W - ref_t.width))
-                y = random.randint(0, max(0, H - ref_t.height))
-
-                # Calculate bbox
-                cx = (x + ref_t.width / 2) / W
-                cy = (y + ref_t.height / 2) / H
-                bw = ref_t.width / W
-                bh = ref_t.height / H
-                current_bbox = (cx, cy, bw, bh)
-
-                # Check visibility (IoU with full image >= 0.8)
-                full_image_bbox = (0.5, 0.5, 1.0, 1.0)
-                visibility_iou = calculate_iou(current_bbox, full_image_bbox)
-
-                if visibility_iou >= 0.8:
-                    # Check IoU with existing logos
-                    overlap = False
-                    for prev_bbox in placed_bboxes:
-                        if calculate_iou(current_bbox, prev_bbox) > iou_threshold:
-                            overlap = True
-                            break
-
-                    if not overlap:
-                        # Augment logo
-                        ref_arr = np.array(ref_t)
-                        auged_ref = logo_aug_pipeline(image=ref_arr)['image']
-                        ref_t = Image.fromarray(auged_ref)
-
-                        # Place logo
-                        bg.paste(ref_t, (x, y), ref_t)
-                        placed_bboxes.append(current_bbox)
-                        bboxes_info.append((cls, current_bbox))
-                        break
-
-                pos_attempts += 1
+            angle = random.uniform(-25, 25)
+
+            sprite = None
+            if sprite_atlas is not None:
+                sprite, entry = sprite_atlas.sample(crop_path, nw, angle)
+            if sprite is not None:
+                ref_t = sprite
+                nw, nh, angle = entry['width'], entry['height'], entry['angle']
             else:
-                # Couldn't place, try next logo
-                break
+                ref = load_rgba(crop_path, asset_cache)
+                nh = int(ref.height * scale)
+                ref_t = resize_image(ref, (nw, nh), resize_backend).rotate(angle, expand=True)
+            ref_w, ref_h = canvas_size(ref_t)
 
+            # Random position: at least 80% visible and IoU with existing logos <= threshold
             attempts += 1
+            if grid is not None:
+                placement = find_placement_grid(grid, ref_w, ref_h, iou_threshold)
+            else:
+                placement = find_placement(W, H, ref_w, ref_h, placed_bboxes,
+                                           iou_threshold=iou_threshold, min_visibility=0.8, num_candidates=10)
+            if placement is None:
+                # Couldn't place, retry with another crop
+                continue
+
+            x, y, current_bbox = placement
+
+            # Augment logo (atlas photometric variants are already augmented)
+            aug_seed = random.randrange(2**32)
+            aug_item = {}
+            if sprite is not None and sprite_atlas.variants(crop_path) > 1:
+                auged_ref = sprite
+            else:
+                auged_ref = apply_seeded_pipeline(logo_aug_pipeline, aug_seed, image=np.array(ref_t))['image']
+                _record_plan(aug_item, logo_aug_pipeline)
+
+            # Place logo
+            paste_sprite(bg, auged_ref, x, y)
+            placed_bboxes.append(current_bbox)
+            bboxes_info.append((cls, current_bbox))
+            if grid is not None:
+                grid.mark(x, y, ref_w, ref_h)
+            if recipe_items is not None:
+                recipe_items.append({'cls': cls, 'path': crop_path, 'aug_seed': aug_seed, 'w': nw / W, 'h': nh / H,
+                                     'angle': angle, 'x': x / W, 'y': y / H, **aug_item})
+            break
+
+    if stats is not None:
+        stats.update({'requested': num_logos, 'placed': len(bboxes_info), 'attempts': attempts})
 
     return bg, bboxes_info
 
@@ -261,6 +320,273 @@ def save_yolo_label(lbl_path: Path, cls: int, bbox: tuple) -> None:
         f.write(f"{cls} {cx:.6f} {cy:.6f} {bw:.6f} {bh:.6f}\n")
 
 
+def get_split(i: int, N: int) -> str:
+    """Assign image index to a split (80/10/10)."""
+    if i < 0.8 * N:
+        return 'train'
+    elif i < 0.9 * N:
+        return 'val'
+    return 'test'
+
+
+def append_jsonl(path: Path, entries: list) -> None:
+    """Append one JSON line per entry."""
+    with open(path, 'a') as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+def drop_jsonl_images(path: Path, images: set) -> None:
+    """Remove the lines of ``images`` from a per-image JSONL file.
+
+    Shards append their lines before they are marked done, so a shard
+    interrupted in between leaves lines that its re-run would duplicate.
+    """
+    if not path.exists():
+        return
+    with open(path, 'r') as f:
+        lines = [line for line in f if line.strip() and json.loads(line)['image'] not in images]
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'w') as f:
+        f.writelines(lines)
+    os.replace(tmp, path)
+
+
+def get_shard_seed(seed: int, shard_id: int) -> int:
+    """Derive a deterministic 32-bit seed for a shard from the run seed."""
+    return int(np.random.SeedSequence([seed, shard_id]).generate_state(1)[0])
+
+
+def render_scene(bgs: list, crops_by_class: dict, bg_objects: list, bg_aug_pipeline, neg_aug_pipeline, logo_aug_pipeline, min_scale_down: float = 0.5, iou_threshold: float = 0.4, max_neg: int = 15, asset_cache: AssetCache = None, placement_mode: str = 'random', stats: dict = None, background_cache: BackgroundCache = None, compositing: str = 'pil', recipe: dict = None, max_logos: int = 10, planned_classes: list = None, sprite_atlas: SpriteAtlas = None, timings: dict = None, resize_backend: str = 'lanczos', asset_pool: SharedAssetPool = None, procedural_backgrounds: float = 0.0, procedural_size: tuple = (1920, 1920)) -> tuple:
+    """Render one synthetic scene: background, distractors and logos.
+
+    With ``compositing='numpy'`` the scene stays in one uint8 canvas that
+    sprites are alpha-blended into in place, and the returned image is that
+    array; otherwise it is a PIL image. If ``recipe`` is given it is filled with
+    everything needed to re-render the scene (see ``recipes.render_recipe``).
+    ``planned_classes`` fixes the logo classes (see ``place_multi_logos``),
+    ``sprite_atlas`` supplies pre-rendered logos and distractors. If ``timings``
+    is given, the ms spent per stage (see ``telemetry.STAGES``) are added to it.
+    The background and runtime sprite resizes use ``resize_backend``.
+    Backgrounds found in ``asset_pool`` are read from shared memory instead of decoded.
+    A ``procedural_backgrounds`` share of backgrounds (all if ``bgs`` is empty)
+    is synthesized at the scaled ``procedural_size`` instead of loaded.
+    """
+    procedural = procedural_backgrounds > 0 and (not bgs or random.random() < procedural_backgrounds)
+    bg_path = None if procedural else random.choice(bgs)
+
+    # Load and resize background (the pyramid resizes while loading)
+    scale_down = random.uniform(min_scale_down, 1.0)
+    bg_seed = None
+    if procedural:
+        bg_seed = random.randrange(2**32)
+        with stage_timer(timings, 'bg_load'):
+            W = int(procedural_size[0] * scale_down)
+            H = int(procedural_size[1] * scale_down)
+            bg = synthesize_background(W, H, np.random.default_rng(bg_seed))
+    elif background_cache is not None:
+        with stage_timer(timings, 'bg_load'):
+            bg = background_cache.load(bg_path, scale_down)
+    else:
+        with stage_timer(timings, 'bg_load'):
+            bg_arr = asset_pool.get(bg_path) if asset_pool is not None else None
+            bg = Image.fromarray(bg_arr) if bg_arr is not None else Image.open(bg_path).convert("RGB")
+        with stage_timer(timings, 'resize'):
+            W_orig, H_orig = bg.size
+            W = int(W_orig * scale_down)
+            H = int(H_orig * scale_down)
+            bg = resize_image(bg, (W, H), resize_backend)
+
+    # Apply background augmentations
+    aug_seed = random.randrange(2**32)
+    with stage_timer(timings, 'bg_aug'):
+        bg_arr = np.array(bg)
+        auged_bg = apply_seeded_pipeline(bg_aug_pipeline, aug_seed, image=bg_arr)['image']
+        if compositing == 'numpy':
+            bg = auged_bg if auged_bg.flags.writeable else auged_bg.copy()
+        else:
+            bg = Image.fromarray(auged_bg)
+
+    distractor_items = logo_items = None
+    if recipe is not None:
+        distractor_items, logo_items = [], []
+        background = {'path': bg_path, 'scale_down': scale_down, 'size': list(bg_arr.shape[1::-1]), 'aug_seed': aug_seed}
+        _record_plan(background, bg_aug_pipeline)
+        if procedural:
+            background['procedural_seed'] = bg_seed
+        elif background_cache is not None:
+            background['pyramid_levels'] = list(background_cache.levels)
+        recipe.update({
+            'background': background,
+            'distractors': distractor_items,
+            'logos': logo_items,
+            'resize_backend': resize_backend,
+        })
+        if sprite_atlas is not None:
+            # Atlas sprites have quantized geometry and their own sizing, see sprite_atlas.py
+            recipe['replayable'] = False
+
+    # Place distractors
+    if bg_objects:
+        with stage_timer(timings, 'distractors'):
+            bg = place_distractors(bg, bg_objects, neg_aug_pipeline, max_neg, asset_cache=asset_cache,
+                                   recipe_items=distractor_items, sprite_atlas=sprite_atlas,
+                                   resize_backend=resize_backend)
+
+    # Place multi-logos
+    with stage_timer(timings, 'logos'):
+        return place_multi_logos(bg, crops_by_class, logo_aug_pipeline, iou_threshold, max_logos, asset_cache=asset_cache,
+                                 placement_mode=placement_mode, stats=stats, recipe_items=logo_items,
+                                 planned_classes=planned_classes, sprite_atlas=sprite_atlas,
+                                 resize_backend=resize_backend)
+
+
+# Re-renders of an image whose planned logos did not all fit
+MAX_PLAN_RENDERS = 5
+
+# Per-process state for shard workers, filled by _init_shard_worker
+_SHARD_CONTEXT = {}
+
+
+def _init_shard_worker(context: dict) -> None:
+    """Initialize shard worker state: asset lists, output paths, pipelines and asset cache."""
+    _SHARD_CONTEXT.clear()
+    _SHARD_CONTEXT.update(context)
+    _SHARD_CONTEXT['asset_cache'] = AssetCache(context['asset_cache_mb'] * 1024 * 1024, pool=context['asset_pool'])
+    _SHARD_CONTEXT['background_cache'] = BackgroundCache(resize_backend=context['resize_backend']) if context['bg_pyramid'] else None
+    _SHARD_CONTEXT['sprite_atlas'] = SpriteAtlas(context['sprite_atlas_dir']) if context['sprite_atlas_dir'] else None
+    _SHARD_CONTEXT['bg_aug_pipeline'] = get_background_aug_pipeline()
+    _SHARD_CONTEXT['neg_aug_pipeline'] = get_neg_aug_pipeline()
+    _SHARD_CONTEXT['logo_aug_pipeline'] = get_logo_aug_pipeline()
+    _SHARD_CONTEXT['aug_budget'] = None
+    if context['aug_budget_ms'] is not None:
+        (_SHARD_CONTEXT['aug_budget'], _SHARD_CONTEXT['bg_aug_pipeline'], _SHARD_CONTEXT['neg_aug_pipeline'],
+         _SHARD_CONTEXT['logo_aug_pipeline']) = get_budgeted_pipelines(context['aug_budget_ms'], context['aug_costs'])
+    _SHARD_CONTEXT['writer'] = AsyncWriter(context['write_threads'], context['write_queue'])
+    _SHARD_CONTEXT['profiler'] = None
+    if context['profile_augmentations']:
+        profiler = _SHARD_CONTEXT['profiler'] = TransformProfiler()
+        profiler.wrap(_SHARD_CONTEXT['bg_aug_pipeline'], 'background')
+        profiler.wrap(_SHARD_CONTEXT['neg_aug_pipeline'], 'neg')
+        profiler.wrap(_SHARD_CONTEXT['logo_aug_pipeline'], 'logo')
+
+
+def _render_shard(shard: dict) -> dict:
+    """Render and save images [start, stop) of one shard with its own seed.
+
+    Splits are assigned 80/10/10 over the shard's batch [batch_start, batch_start + batch_count).
+    """
+    shard_id, start, stop, shard_seed = shard['id'], shard['start'], shard['stop'], shard['seed']
+    ctx = _SHARD_CONTEXT
+    random.seed(shard_seed)
+    np.random.seed(shard_seed)
+
+    t0 = time.perf_counter()
+    class_counts = {0: 0, 1: 0, 2: 0}
+    placement_stats = []
+    images = []
+    recipes = []
+    stage_records = []
+    label_records = []
+    writer = ctx['writer']
+    packed = []
+    for i in range(start, stop):
+        # Re-render the same index until at least one logo is placed; with a class
+        # plan, until all planned logos are placed or MAX_PLAN_RENDERS is reached,
+        # keeping the render that placed the most planned logos
+        planned_classes = shard['plan'][i - start] if shard['plan'] is not None else None
+        best = None
+        renders = 0
+        # Stage times accumulate over re-renders of the same image
+        timings = {}
+        while best is None or not best[1] or (planned_classes is not None and len(best[1]) < len(planned_classes) and renders < MAX_PLAN_RENDERS):
+            if ctx['aug_budget']:
+                ctx['aug_budget'].start_image()
+            stats = {}
+            recipe = {} if ctx['emit_recipes'] else None
+            bg, bboxes_info = render_scene(
+                ctx['bgs'], ctx['crops_by_class'], ctx['bg_objects'],
+                ctx['bg_aug_pipeline'], ctx['neg_aug_pipeline'], ctx['logo_aug_pipeline'],
+                ctx['min_scale_down'], ctx['iou_threshold'], ctx['max_neg'],
+                asset_cache=ctx['asset_cache'], placement_mode=ctx['placement_mode'], stats=stats,
+                background_cache=ctx['background_cache'], compositing=ctx['compositing'], recipe=recipe,
+                max_logos=ctx['max_logos'], planned_classes=planned_classes, sprite_atlas=ctx['sprite_atlas'],
+                timings=timings, resize_backend=ctx['resize_backend'], asset_pool=ctx['asset_pool'],
+                procedural_backgrounds=ctx['procedural_backgrounds'], procedural_size=ctx['procedural_size']
+            )
+            renders += 1
+            if best is None or len(bboxes_info) > len(best[1]):
+                best = (bg, bboxes_info, stats, recipe)
+        bg, bboxes_info, stats, recipe = best
+
+        split = get_split(i - shard['batch_start'], shard['batch_count'])
+        fname = f"synth_{i:05d}.jpg"
+        placement_stats.append({'image': fname, 'split': split, **stats, 'renders': renders})
+        if recipe is not None:
+            recipes.append({'image': fname, 'split': split, **recipe})
+
+        # Labels for all placed logos
+        label_text = ""
+        image_counts = [0, 0, 0]
+        for cls_label, bbox in bboxes_info:
+            cx, cy, bw, bh = bbox
+            label_text += f"{cls_label} {cx:.6f} {cy:.6f} {bw:.6f} {bh:.6f}\n"
+            class_counts[cls_label] += 1
+            image_counts[cls_label] += 1
+        images.append({'file': fname, 'split': split, 'class_counts': image_counts})
+        width, height = canvas_size(bg)
+        labels = np.array([(cls_label, *bbox) for cls_label, bbox in bboxes_info], dtype=np.float32).reshape(-1, 5)
+        label_records.append({'file': fname, 'split': split, 'width': width, 'height': height, 'labels': labels})
+        stage_records.append({'image': fname, 'split': split, 'shard': shard_id, 'pid': os.getpid(), 'renders': renders, 'timings': timings})
+
+        # Encode and write in the background while the next scene is composed
+        if ctx['output_format'] == 'tar':
+            packed.append((split, fname, writer.submit(timed, timings, 'encode', encode_jpeg, bg, 90, ctx['jpeg_backend']), label_text, timings))
+        else:
+            writer.submit(
+                write_sample,
+                ctx['out_base'] / 'images' / split / fname,
+                ctx['out_base'] / 'labels' / split / fname.replace('.jpg', '.txt'),
+                bg, label_text, 90, ctx['jpeg_backend'], timings
+            )
+
+    # The shard is reported done only after all its files are written
+    writer.wait()
+    shard_writers = {}
+    for split, fname, future, label_text, timings in packed:
+        # One tar per split and shard, so shards of different workers never share a file
+        shard_writer = shard_writers.get(split)
+        if shard_writer is None:
+            shard_writer = shard_writers[split] = ShardWriter(ctx['out_base'] / 'packed' / split, f"shard_{shard_id:05d}", max_count=stop - start)
+        with stage_timer(timings, 'write'):
+            shard_writer.write(fname, future.result(), label_text)
+    for shard_writer in shard_writers.values():
+        shard_writer.close()
+
+    # Flatten stage times once encode and write have finished
+    for record in stage_records:
+        timings = record.pop('timings')
+        record.update({stage: round(ms, 3) for stage, ms in timings.items()})
+        record['total'] = round(sum(timings.values()), 3)
+
+    return {
+        'shard_id': shard_id,
+        'pid': os.getpid(),
+        'images': stop - start,
+        'class_counts': class_counts,
+        'image_info': images,
+        'seconds': time.perf_counter() - t0,
+        'asset_cache': ctx['asset_cache'].stats(),
+        'placement_stats': placement_stats,
+        'stage_records': stage_records,
+        'label_records': label_records,
+        'recipes': recipes,
+        'background_cache': ctx['background_cache'].stats() if ctx['background_cache'] else None,
+        'transform_profile': ctx['profiler'].stats() if ctx['profiler'] else None,
+        'aug_budget': ctx['aug_budget'].stats() if ctx['aug_budget'] else None,
+    }
+
+
 def generate_synthetic_dataset(
     crops_dir: Path,
     bg_dir: Path,
@@ -270,88 +596,382 @@ def generate_synthetic_dataset(
     bg_objects_dir: Path = None,
     min_scale_down: float = 0.5,
     iou_threshold: float = 0.4,
-    max_neg: int = 15
+    max_neg: int = 15,
+    max_logos: int = 10,
+    workers: int = 1,
+    seed: int = None,
+    shard_size: int = 100,
+    asset_cache_mb: int = 512,
+    placement_mode: str = 'random',
+    bg_pyramid: bool = False,
+    compositing: str = 'pil',
+    resume: bool = False,
+    extend: bool = False,
+    emit_recipes: bool = False,
+    output_format: str = 'files',
+    profile_augmentations: bool = False,
+    aug_budget_ms: float = None,
+    aug_costs_path: Path = None,
+    write_threads: int = 2,
+    write_queue: int = 8,
+    jpeg_backend: str = 'pil',
+    class_targets='balanced',
+    sprite_atlas_dir: Path = None,
+    prometheus_path: Path = None,
+    resize_backend: str = 'lanczos',
+    asset_pool_mb: int = 0,
+    pool_backgrounds: bool = False,
+    procedural_backgrounds: float = 0.0,
+    procedural_size: tuple = (1920, 1920)
 ) -> None:
-    """Generate synthetic dataset with advanced features."""
+    """Generate synthetic dataset with advanced features.
+
+    The N images are split into fixed-size shards, each rendered with its own
+    seed derived from ``seed``. Shards are spread over ``workers`` processes, so
+    file names, splits and class counts do not depend on the number of workers.
+    Each worker keeps decoded crops and distractors in an LRU asset cache of
+    ``asset_cache_mb`` megabytes. Per-image placement statistics are written to
+    ``placement_stats.jsonl`` in ``out_base`` as each shard completes. With ``bg_pyramid`` backgrounds
+    are read from a persisted multi-scale pyramid instead of full JPEG decodes.
+    ``compositing='numpy'`` keeps each scene in a single uint8 canvas until
+    it is encoded.
+
+    Progress is tracked in ``manifest.json`` in ``out_base`` (generator version,
+    parameters, seed, shards and per-image split and class counts). With
+    ``resume`` only shards not yet completed are rendered, with the same seeds,
+    and N is ignored. With ``extend`` N more images are appended after the
+    existing ones with their own 80/10/10 split. Both reuse the manifest seed
+    and require the same content parameters.
+
+    With ``emit_recipes`` a compact per-image render recipe is written to
+    ``recipes.jsonl`` as each shard completes, so scenes can be re-rendered with
+    ``recipes.render_from_recipes``.
+
+    With ``output_format='tar'`` images and labels are packed into tar shards
+    with offset indexes under ``out_base/packed/<split>`` (one per shard and
+    split) instead of two small files per image; read them with
+    ``shards.ShardReader`` or unpack with ``shards.unpack_shards``.
+
+    With ``profile_augmentations`` the wall time of every applied transform is
+    recorded per input size; a summary table is printed and the raw numbers are
+    written to ``transform_profile.json``.
+
+    With ``aug_budget_ms`` augmentations run through ``budget.BudgetedPipeline``:
+    expensive transforms are moved to reduced resolution or skipped so that the
+    estimated augmentation time per image stays within the budget. Per-transform
+    costs are read from ``aug_costs_path`` (``transform_profile.json`` or
+    ``benchmark_augmentations.py --json`` output) or calibrated on start, and
+    saved to ``aug_costs.json`` so resume and extend plan with the same costs.
+
+    JPEG encoding and file writes run on ``write_threads`` threads per worker
+    behind a queue of at most ``write_queue`` images (0 threads writes inline).
+    ``jpeg_backend`` is 'pil', 'opencv' or 'auto' (fastest by micro-benchmark).
+
+    ``class_targets`` sets per-class logo instance targets for the N images:
+    'balanced' (equal classes, on average (1 + max_logos) / 2 logos per image),
+    a dict {cls: count}, or None for independent random classes. With targets
+    the class composition of every image is planned up front
+    (``scheduler.plan_class_composition``) and placement follows the plan; an
+    image that does not fit its plan keeps the best of ``MAX_PLAN_RENDERS``
+    renders and shortfalls are reported. The targets are stored per batch in
+    the manifest.
+
+    With ``sprite_atlas_dir`` (built by ``build_sprite_atlas.py``) logos and
+    distractors are taken pre-resized and pre-rotated from a memory-mapped
+    sprite atlas; assets missing from the atlas are transformed at runtime.
+    Atlas sprites keep the asset's aspect ratio and quantize sizes and angles,
+    so the box distribution differs from runtime sprites, and their recipes
+    are marked non-replayable.
+
+    Every image records the ms spent per stage (background load, resize,
+    background augmentation, distractors, logos, encode, write); the trace is
+    written to ``stage_timings.jsonl``, per-stage percentiles are printed and
+    written to ``stage_summary.json`` and, with ``prometheus_path``, in
+    Prometheus text format.
+
+    ``resize_backend`` resizes backgrounds and sprites: 'lanczos' (PIL LANCZOS
+    at every scale), 'pil' or 'opencv' (area kernel for strong downscales,
+    linear otherwise; see ``resize.select_kernel``).
+
+    With ``asset_pool_mb`` > 0 crops and distractors are decoded once, up to
+    that many megabytes, into a shared memory segment
+    (``shared_pool.SharedAssetPool``) that all workers read zero-copy instead
+    of keeping their own copies in the asset cache. ``pool_backgrounds`` also
+    pools the backgrounds (not with ``bg_pyramid``): that saves their JPEG
+    decode per image, but costs their full decoded size in memory.
+
+    ``procedural_backgrounds`` is the share of backgrounds synthesized on the
+    fly (``background_utils.synthesize_background``) at ``procedural_size``
+    times the random scale instead of loaded from ``bg_dir``; with 1.0 (or an
+    empty ``bg_dir``) no background files are needed.
+
+    A columnar index of all boxes (image, split, class, cx, cy, w, h and image
+    sizes) is written to ``labels_index.npz``; query it with
+    ``label_index.LabelIndex``.
+    """
+    if placement_mode not in ('random', 'grid'):
+        raise ValueError(f"Unknown placement_mode: {placement_mode}")
+    if compositing not in ('pil', 'numpy'):
+        raise ValueError(f"Unknown compositing: {compositing}")
+    if output_format not in ('files', 'tar'):
+        raise ValueError(f"Unknown output_format: {output_format}")
+    jpeg_backend = select_jpeg_backend(jpeg_backend)
+    validate_resize_backend(resize_backend)
     if aug_pipeline is None:
         aug_pipeline = get_augmentation_pipeline()
 
-    # Get specialized pipelines
-    bg_aug_pipeline = get_background_aug_pipeline()
-    neg_aug_pipeline = get_neg_aug_pipeline()
-    logo_aug_pipeline = get_logo_aug_pipeline()
-
-    setup_output_dirs(out_base)
+    if output_format == 'tar':
+        out_base.mkdir(parents=True, exist_ok=True)
+    else:
+        setup_output_dirs(out_base)
 
     crops_by_class = load_crops_by_class(crops_dir)
     bgs = load_backgrounds(bg_dir)
     bg_objects = load_background_objects(bg_objects_dir) if bg_objects_dir and bg_objects_dir.exists() else []
 
-    if not all(len(crops) > 0 for crops in crops_by_class.values()) or not bgs:
+    if not 0 <= procedural_backgrounds <= 1:
+        raise ValueError(f"procedural_backgrounds must be in [0, 1]: {procedural_backgrounds}")
+    if not all(len(crops) > 0 for crops in crops_by_class.values()) or not (bgs or procedural_backgrounds):
         raise ValueError("No crops or backgrounds found.")
 
-    # Balanced class generation
-    targets_per_class = N // 3
-    class_counts = {0: 0, 1: 0, 2: 0}
-    max_per_class = targets_per_class + (N % 3)  # Distribute remainder
-
-    i = 0
-    while sum(class_counts.values()) < N:
-        # Choose class with remaining targets
-        available_classes = [cls for cls in [0, 1, 2] if class_counts[cls] < max_per_class]
-        if not available_classes:
-            break
-        cls = random.choice(available_classes)
-
-        bg_path = random.choice(bgs)
-        crop_path = random.choice(crops_by_class[cls])
-
-        # Load and resize background
-        bg = Image.open(bg_path).convert("RGB")
-        W_orig, H_orig = bg.size
-        scale_down = random.uniform(min_scale_down, 1.0)
-        W = int(W_orig * scale_down)
-        H = int(H_orig * scale_down)
-        bg = bg.resize((W, H), Image.LANCZOS)
-
-        # Apply background augmentations
-        bg_arr = np.array(bg)
-        auged_bg = bg_aug_pipeline(image=bg_arr)['image']
-        bg = Image.fromarray(auged_bg)
-
-        # Place distractors
-        if bg_objects:
-            bg = place_distractors(bg, bg_objects, neg_aug_pipeline, max_neg)
-
-        # Place multi-logos
-        bg, bboxes_info = place_multi_logos(bg, crops_by_class, logo_aug_pipeline, iou_threshold)
-
-        # If no logos were placed, skip this image
-        if not bboxes_info:
-            continue
-
-        # Split assignment (80/10/10)
-        if i < 0.8 * N:
-            split = 'train'
-        elif i < 0.9 * N:
-            split = 'val'
+    params = {
+        'min_scale_down': min_scale_down,
+        'iou_threshold': iou_threshold,
+        'max_neg': max_neg,
+        'max_logos': max_logos,
+        'placement_mode': placement_mode,
+        'bg_pyramid': bg_pyramid,
+        'compositing': compositing,
+        'output_format': output_format,
+        'aug_budget_ms': aug_budget_ms,
+        'sprite_atlas_dir': str(sprite_atlas_dir) if sprite_atlas_dir else None,
+        'resize_backend': resize_backend,
+        'procedural_backgrounds': procedural_backgrounds,
+        'procedural_size': list(procedural_size),
+    }
+    if resume or extend:
+        manifest = load_manifest(out_base)
+        if manifest is None:
+            raise ValueError(f"No manifest found in {out_base}, nothing to resume or extend.")
+        check_params(manifest, params)
+        if seed is not None and seed != manifest['seed']:
+            print(f"Warning: using manifest seed {manifest['seed']} instead of {seed}")
+        seed = manifest['seed']
+    else:
+        if seed is None:
+            seed = random.randrange(2**32)
+        manifest = new_manifest(seed, params)
+    if extend or not resume:
+        if class_targets == 'balanced':
+            class_targets = balanced_targets(N, max_logos)
+        if class_targets and not N <= sum(class_targets.values()) <= N * max_logos:
+            raise ValueError(f"class_targets {class_targets} do not fit in {N} images with 1..{max_logos} logos each")
+        add_batch(manifest, N, shard_size, class_targets)
+    save_manifest(out_base, manifest)
+
+    aug_costs = None
+    if aug_budget_ms is not None:
+        saved_costs_path = out_base / 'aug_costs.json'
+        if (resume or extend) and saved_costs_path.exists():
+            aug_costs_path = saved_costs_path
+        if aug_costs_path:
+            with open(aug_costs_path, 'r') as f:
+                aug_costs = load_transform_costs(json.load(f))
+            print(f"Augmentation costs: {aug_costs_path}")
+        else:
+            print("Calibrating augmentation costs...")
+            aug_costs = calibrate_transform_costs()
+        with open(saved_costs_path, 'w') as f:
+            json.dump(costs_to_stats(aug_costs), f, indent=2)
+
+    asset_pool = None
+    if asset_pool_mb > 0:
+        # Backgrounds from the pyramid are memory-mapped already
+        pool_groups = [([crop for crops in crops_by_class.values() for crop in crops], 'RGBA'), (bg_objects, 'RGBA')]
+        if pool_backgrounds and not bg_pyramid:
+            pool_groups.append((bgs, 'RGB'))
+        asset_pool = SharedAssetPool.create(pool_groups, asset_pool_mb * 1024 * 1024)
+        n_assets = sum(len(paths) for paths, _ in pool_groups)
+        print(f"Shared asset pool: {len(asset_pool)}/{n_assets} assets, {asset_pool.nbytes / 1024 / 1024:.1f}/{asset_pool_mb} MB")
+
+    context = {
+        'out_base': out_base,
+        'bgs': bgs,
+        'crops_by_class': crops_by_class,
+        'bg_objects': bg_objects,
+        'asset_cache_mb': asset_cache_mb,
+        'emit_recipes': emit_recipes,
+        'profile_augmentations': profile_augmentations,
+        'aug_costs': aug_costs,
+        'write_threads': write_threads,
+        'write_queue': write_queue,
+        'jpeg_backend': jpeg_backend,
+        'asset_pool': asset_pool,
+        **params,
+    }
+    shards = []
+    plans = {}
+    for shard in pending_shards(manifest):
+        batch = manifest['batches'][shard['batch']]
+        plan = None
+        if batch.get('class_targets'):
+            # The plan is recomputed from the manifest seed, so resume gets the same one
+            if shard['batch'] not in plans:
+                plans[shard['batch']] = plan_class_composition(batch['count'], batch['class_targets'], max_logos,
+                                                               seed=[seed, shard['batch'], 0x706C616E])
+            offset = shard['start'] - batch['start']
+            plan = plans[shard['batch']][offset:offset + shard['stop'] - shard['start']]
+        shards.append({
+            'id': shard['id'],
+            'start': shard['start'],
+            'stop': shard['stop'],
+            'seed': get_shard_seed(seed, shard['id']),
+            'batch_start': batch['start'],
+            'batch_count': batch['count'],
+            'plan': plan,
+        })
+    n_run = sum(shard['stop'] - shard['start'] for shard in shards)
+
+    placement_path = out_base / 'placement_stats.jsonl'
+    trace_path = out_base / 'stage_timings.jsonl'
+    recipes_path = out_base / 'recipes.jsonl'
+    if emit_recipes and sprite_atlas_dir:
+        print("Warning: recipes of scenes rendered with a sprite atlas are marked non-replayable")
+    pending_images = {f"synth_{i:05d}.jpg" for shard in shards for i in range(shard['start'], shard['stop'])}
+    for path in [placement_path, trace_path] + ([recipes_path] if emit_recipes else []):
+        if resume or extend:
+            drop_jsonl_images(path, pending_images)
         else:
-            split = 'test'
+            path.unlink(missing_ok=True)
+
+    def record(result):
+        # Persist progress after every shard so an interrupted run can resume;
+        # per-image files are appended before the shard is marked done
+        results.append(result)
+        append_jsonl(placement_path, result['placement_stats'])
+        write_trace(trace_path, result['stage_records'], append=True)
+        if emit_recipes:
+            append_jsonl(recipes_path, result['recipes'])
+        mark_shard_done(manifest, result['shard_id'], result['image_info'])
+        save_manifest(out_base, manifest)
+        pbar.update(result['images'])
+
+    t0 = time.perf_counter()
+    results = []
+    try:
+        with tqdm(total=n_run, desc=f"Generating synthetic images ({workers} workers)", unit="img") as pbar:
+            if workers <= 1:
+                _init_shard_worker(context)
+                for shard in shards:
+                    record(_render_shard(shard))
+                _SHARD_CONTEXT['writer'].close()
+                _SHARD_CONTEXT.clear()
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_worker, initargs=(context,)) as executor:
+                    futures = [executor.submit(_render_shard, shard) for shard in shards]
+                    for future in as_completed(futures):
+                        record(future.result())
+    finally:
+        if asset_pool is not None:
+            asset_pool.unlink()
+    elapsed = time.perf_counter() - t0
+    results.sort(key=lambda result: result['shard_id'])
 
-        fname = f"synth_{i:05d}.jpg"
-        out_path = out_base / 'images' / split / fname
-        bg.save(out_path, quality=90)
-
-        # Save labels for all placed logos
-        lbl_path = out_base / 'labels' / split / fname.replace('.jpg', '.txt')
-        with open(lbl_path, 'w') as f:
-            for cls_label, bbox in bboxes_info:
-                cx, cy, bw, bh = bbox
-                f.write(f"{cls_label} {cx:.6f} {cy:.6f} {bw:.6f} {bh:.6f}\n")
-                class_counts[cls_label] += 1
-
-        i += 1
-
-    print(f"Generated {i} synthetic images with balanced classes: {class_counts}")
-    print(f"Splits: {int(0.8*i)} train, {int(0.1*i)} val, {int(0.1*i)} test in {out_base}")
-    print(f"Background resize: min_scale_down={min_scale_down}, distractors: {len(bg_objects) if bg_objects else 0} objects")
\ No newline at end of file
+    class_counts = {0: 0, 1: 0, 2: 0}
+    per_worker = {}
+    placement_stats = [entry for result in results for entry in result['placement_stats']]
+    stage_records = [record for result in results for record in result['stage_records']]
+    stage_summary = summarize_stages(stage_records)
+    with open(out_base / 'stage_summary.json', 'w') as f:
+        json.dump(stage_summary, f, indent=2)
+    if prometheus_path:
+        write_prometheus(prometheus_path, stage_summary)
+
+    for result in results:
+        for cls, count in result['class_counts'].items():
+            class_counts[cls] += count
+        stats = per_worker.setdefault(result['pid'], {'images': 0, 'seconds': 0.0})
+        stats['images'] += result['images']
+        stats['seconds'] += result['seconds']
+        # Cache counters are cumulative per process, keep the latest snapshot
+        stats['asset_cache'] = result['asset_cache']
+        stats['background_cache'] = result['background_cache']
+        stats['transform_profile'] = result['transform_profile']
+        stats['aug_budget'] = result['aug_budget']
+
+    dataset_counts, split_counts = dataset_summary(manifest)
+    label_index = build_index([record for result in results for record in result['label_records']])
+    index_path = out_base / INDEX_NAME
+    if resume or extend:
+        label_index = merge_indexes(load_index(index_path), label_index) if index_path.exists() else None
+        if label_index is None or len(label_index['images']) != sum(split_counts.values()):
+            # The previous run ended before writing its index: rebuild from the dataset
+            label_index = index_dataset(out_base)
+    save_index(index_path, label_index)
+
+    print(f"Generated {n_run} synthetic images with classes: {class_counts}")
+    if plans:
+        planned = plan_totals([classes for shard in shards if shard['plan'] for classes in shard['plan']])
+        print(f"Class plan: {planned} planned, {sum(class_counts.values())}/{sum(planned.values())} logos placed")
+        shortfall = {cls: planned[cls] - class_counts[cls] for cls in planned if class_counts[cls] < planned[cls]}
+        if shortfall:
+            short_images = sum(1 for entry in placement_stats if entry['placed'] < entry['requested'])
+            print(f"Warning: class targets missed by {shortfall} logos in {short_images} images "
+                  f"that did not fit all planned logos in {MAX_PLAN_RENDERS} renders")
+    print(f"Dataset: {sum(split_counts.values())}/{total_images(manifest)} images, classes {dataset_counts}")
+    print(f"Splits: {split_counts['train']} train, {split_counts['val']} val, {split_counts['test']} test in {out_base}")
+    print(f"Background resize: min_scale_down={min_scale_down}, distractors: {len(bg_objects) if bg_objects else 0} objects")
+    if procedural_backgrounds:
+        print(f"Procedural backgrounds: {procedural_backgrounds:.0%} at {procedural_size[0]}x{procedural_size[1]}")
+    print(f"Label index: {len(label_index['image_id'])} boxes of {len(label_index['images'])} images in {index_path}")
+    print(f"Seed: {seed}, shards: {len(shards)} rendered, {len(manifest['shards'])} total")
+    print(f"Resize backend: {resize_backend}")
+    print(f"Writer: {write_threads} threads, queue {write_queue}, JPEG backend {jpeg_backend}")
+    print(f"Throughput: {n_run / max(elapsed, 1e-9):.2f} img/s aggregate over {workers} workers ({elapsed:.1f}s)")
+    for pid, stats in sorted(per_worker.items()):
+        rate = stats['images'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        print(f"  worker {pid}: {stats['images']} images, {rate:.2f} img/s")
+
+    requested = sum(entry['requested'] for entry in placement_stats)
+    placed = sum(entry['placed'] for entry in placement_stats)
+    attempts = sum(entry['attempts'] for entry in placement_stats)
+    rerendered = sum(1 for entry in placement_stats if entry['renders'] > 1)
+    print(f"Placement ({placement_mode}): {placed}/{requested} requested logos placed ({placed / max(1, requested):.1%}), "
+          f"{attempts / max(1, n_run):.1f} attempts per image, {rerendered} images re-rendered")
+
+    cache_stats = [stats['asset_cache'] for stats in per_worker.values()]
+    hits = sum(c['hits'] for c in cache_stats)
+    misses = sum(c['misses'] for c in cache_stats)
+    used_mb = max((c['bytes'] for c in cache_stats), default=0) / 1024 / 1024
+    print(f"Asset cache: {hits} hits, {misses} misses, hit rate {hits / max(1, hits + misses):.1%}, "
+          f"evictions {sum(c['evictions'] for c in cache_stats)}, up to {used_mb:.1f}/{asset_cache_mb} MB used per worker")
+    if asset_pool is not None:
+        print(f"Shared asset pool: {sum(c['pool_hits'] for c in cache_stats)} reads from shared memory")
+
+    if bg_pyramid:
+        bg_stats = [stats['background_cache'] for stats in per_worker.values()]
+        print(f"Background pyramid: {sum(c['hits'] for c in bg_stats)} hits, {sum(c['disk_loads'] for c in bg_stats)} disk loads, "
+              f"{sum(c['builds'] for c in bg_stats)} levels built, {sum(c['direct_decodes'] for c in bg_stats)} direct decodes, "
+              f"{sum(c['upscales'] for c in bg_stats)} upscaled from the top level")
+
+    if aug_budget_ms is not None:
+        budget_stats = [stats['aug_budget'] for stats in per_worker.values()]
+        skipped, reduced = {}, {}
+        for budget_stat in budget_stats:
+            for name, count in budget_stat['skipped'].items():
+                skipped[name] = skipped.get(name, 0) + count
+            for name, count in budget_stat['reduced'].items():
+                reduced[name] = reduced.get(name, 0) + count
+        print(f"Augmentation budget: {aug_budget_ms} ms/image, skipped {skipped}, reduced resolution {reduced}")
+
+    print("Stage timings (ms per image, encode and write run on writer threads):")
+    print(format_stage_table(stage_summary))
+    if prometheus_path:
+        print(f"Prometheus metrics: {prometheus_path}")
+
+    if profile_augmentations:
+        profile = merge_profiles([stats['transform_profile'] for stats in per_worker.values()])
+        with open(out_base / 'transform_profile.json', 'w') as f:
+            json.dump(profile, f, indent=2)
+        print("Augmentation profile (applied transforms, wall time):")
+        print(format_profile_table(profile))
@@ -0,0 +1,202 @@
+import io
+import os
+from pathlib import Path
+from PIL import Image
+import numpy as np
+from .shards import ShardReader, parse_labels
+
+INDEX_NAME = "labels_index.npz"
+SPLITS = ('train', 'val', 'test')
+
+# Per-image columns (indexed by image_id) and per-box columns
+IMAGE_COLUMNS = ('images', 'image_split', 'image_w', 'image_h')
+BOX_COLUMNS = ('image_id', 'split', 'cls', 'cx', 'cy', 'w', 'h')
+
+
+def build_index(records: list) -> dict:
+    """Build index columns from per-image records.
+
+    Each record has ``file``, ``split``, ``width`` and ``height`` (0 if
+    unknown) and ``labels``, an (n, 5) array of ``cls cx cy w h`` rows.
+    Images without boxes are kept in the per-image columns.
+    """
+    counts = np.array([len(record['labels']) for record in records], dtype=np.int64)
+    image_split = np.array([SPLITS.index(record['split']) for record in records], dtype=np.int8)
+    boxes = np.concatenate([np.asarray(record['labels'], dtype=np.float32).reshape(-1, 5) for record in records] or [np.zeros((0, 5), np.float32)])
+    return {
+        'images': np.array([record['file'] for record in records], dtype=str).reshape(-1),
+        'image_split': image_split,
+        'image_w': np.array([record['width'] for record in records], dtype=np.int32),
+        'image_h': np.array([record['height'] for record in records], dtype=np.int32),
+        'image_id': np.repeat(np.arange(len(records), dtype=np.int32), counts),
+        'split': np.repeat(image_split, counts),
+        'cls': boxes[:, 0].astype(np.int8),
+        'cx': boxes[:, 1].copy(),
+        'cy': boxes[:, 2].copy(),
+        'w': boxes[:, 3].copy(),
+        'h': boxes[:, 4].copy(),
+    }
+
+
+def merge_indexes(old: dict, new: dict) -> dict:
+    """Append ``new`` to ``old``; images present in both are taken from ``new``."""
+    keep = ~np.isin(old['images'], new['images'])
+    box_keep = keep[old['image_id']]
+    remap = (np.cumsum(keep) - 1).astype(np.int32)
+    merged = {name: np.concatenate([old[name][keep], new[name]]) for name in IMAGE_COLUMNS}
+    merged.update({name: np.concatenate([old[name][box_keep], new[name]]) for name in BOX_COLUMNS if name != 'image_id'})
+    merged['image_id'] = np.concatenate([remap[old['image_id'][box_keep]], new['image_id'] + np.int32(keep.sum())])
+    return merged
+
+
+def save_index(path: Path, index: dict) -> None:
+    """Atomically write index columns to an uncompressed .npz."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'wb') as f:
+        np.savez(f, **index)
+    os.replace(tmp, path)
+
+
+def load_index(path: Path) -> dict:
+    with np.load(path) as data:
+        return {name: data[name] for name in IMAGE_COLUMNS + BOX_COLUMNS}
+
+
+def index_dataset(out_base: Path, packed_dir: Path = None, splits: tuple = SPLITS, read_sizes: bool = True) -> dict:
+    """Index an existing dataset: ``images/`` and ``labels/`` files or tar shards.
+
+    Tar shards in ``packed_dir`` (default ``out_base/packed`` when there is no
+    ``labels/`` directory) are read through their offset indexes. With
+    ``read_sizes`` image sizes are read from the image headers.
+    """
+    out_base = Path(out_base)
+    if packed_dir is None and not (out_base / 'labels').exists():
+        packed_dir = out_base / 'packed'
+
+    records = []
+    for split in splits:
+        if packed_dir is not None:
+            if not (Path(packed_dir) / split).exists():
+                continue
+            reader = ShardReader(packed_dir, split)
+            for i in range(len(reader)):
+                fname, image_bytes, label_text = reader.read(i)
+                width, height = Image.open(io.BytesIO(image_bytes)).size if read_sizes else (0, 0)
+                records.append({'file': fname, 'split': split, 'width': width, 'height': height, 'labels': parse_labels(label_text)})
+            reader.close()
+        else:
+            labels_dir = out_base / 'labels' / split
+            for img_path in sorted((out_base / 'images' / split).glob('*.jpg')):
+                lbl_path = labels_dir / (img_path.stem + '.txt')
+                labels = parse_labels(lbl_path.read_text()) if lbl_path.exists() else np.zeros((0, 5), np.float32)
+                width, height = Image.open(img_path).size if read_sizes else (0, 0)
+                records.append({'file': img_path.name, 'split': split, 'width': width, 'height': height, 'labels': labels})
+    return build_index(records)
+
+
+class LabelIndex:
+    """Vectorized queries over a columnar box index.
+
+    ``where`` returns a filtered view, e.g.
+    ``LabelIndex.load(path).where(split='train', cls=0, area_px=(0, 32 ** 2))``;
+    counts, histograms and percentiles are computed over the selected boxes.
+    Besides the stored columns, ``area``, ``aspect`` (w / h) and pixel sizes
+    ``w_px``, ``h_px``, ``area_px`` (NaN for unknown image sizes) are derived.
+    """
+
+    def __init__(self, columns: dict, mask: np.ndarray = None):
+        self.columns = columns
+        self.mask = np.ones(len(columns['image_id']), dtype=bool) if mask is None else mask
+
+    @classmethod
+    def load(cls, path: Path) -> 'LabelIndex':
+        return cls(load_index(path))
+
+    def __len__(self) -> int:
+        return int(self.mask.sum())
+
+    def _all(self, name: str) -> np.ndarray:
+        c = self.columns
+        if name in BOX_COLUMNS:
+            return c[name]
+        if name == 'area':
+            return c['w'] * c['h']
+        if name == 'aspect':
+            return c['w'] / np.maximum(c['h'], 1e-9)
+        if name in ('w_px', 'h_px', 'area_px'):
+            image_w = np.where(c['image_w'] > 0, c['image_w'], np.nan)[c['image_id']]
+            image_h = np.where(c['image_h'] > 0, c['image_h'], np.nan)[c['image_id']]
+            if name == 'w_px':
+                return c['w'] * image_w
+            if name == 'h_px':
+                return c['h'] * image_h
+            return c['w'] * image_w * c['h'] * image_h
+        raise KeyError(f"Unknown column: {name}")
+
+    def column(self, name: str) -> np.ndarray:
+        """Values of a stored or derived column for the selected boxes."""
+        return self._all(name)[self.mask]
+
+    def where(self, split=None, cls=None, image=None, **ranges) -> 'LabelIndex':
+        """Filter by split name(s), class(es), image name(s) and ``column=(lo, hi)`` ranges (lo <= x < hi, None for open)."""
+        mask = self.mask.copy()
+        if split is not None:
+            splits = [split] if isinstance(split, str) else split
+            mask &= np.isin(self.columns['split'], [SPLITS.index(s) for s in splits])
+        if cls is not None:
+            mask &= np.isin(self.columns['cls'], np.atleast_1d(cls))
+        if image is not None:
+            image_ids = np.flatnonzero(np.isin(self.columns['images'], np.atleast_1d(image)))
+            mask &= np.isin(self.columns['image_id'], image_ids)
+        for name, (lo, hi) in ranges.items():
+            values = self._all(name)
+            if lo is not None:
+                mask &= values >= lo
+            if hi is not None:
+                mask &= values < hi
+        return LabelIndex(self.columns, mask)
+
+    def class_counts(self) -> dict:
+        counts = np.bincount(self.column('cls'), minlength=3)
+        return {cls: int(count) for cls, count in enumerate(counts)}
+
+    def split_counts(self) -> dict:
+        counts = np.bincount(self.column('split'), minlength=len(SPLITS))
+        return {split: int(count) for split, count in zip(SPLITS, counts)}
+
+    def histogram(self, name: str, bins=50, range: tuple = None) -> tuple:
+        """np.histogram (counts, edges) of a column over the selected boxes, ignoring NaN."""
+        values = self.column(name)
+        return np.histogram(values[~np.isnan(values)], bins=bins, range=range)
+
+    def percentiles(self, name: str, q: tuple = (5, 50, 95)) -> dict:
+        values = self.column(name)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return {}
+        return {p: float(v) for p, v in zip(q, np.percentile(values, q))}
+
+    def small_share(self, max_side_px: float = 32) -> float:
+        """Share of selected boxes with pixel area below max_side_px ** 2 (COCO 'small')."""
+        area = self.column('area_px')
+        area = area[~np.isnan(area)]
+        return float((area < max_side_px ** 2).mean()) if len(area) else 0.0
+
+    def boxes_per_image(self) -> np.ndarray:
+        """Selected box count per indexed image (images without selected boxes count 0)."""
+        return np.bincount(self.column('image_id'), minlength=len(self.columns['images']))
+
+    def image_names(self) -> list:
+        """Names of images with at least one selected box."""
+        return self.columns['images'][np.unique(self.column('image_id'))].tolist()
+
+    def summary(self) -> dict:
+        return {
+            'boxes': len(self),
+            'indexed_images': len(self.columns['images']),
+            'class_counts': self.class_counts(),
+            'split_counts': self.split_counts(),
+            'w_px_percentiles': self.percentiles('w_px'),
+            'small_share': self.small_share(),
+        }
@@ -0,0 +1,109 @@
+import json
+import os
+from pathlib import Path
+from . import __version__
+
+MANIFEST_NAME = "manifest.json"
+
+# Parameters that change rendered content or its layout; resume/extend requires them to match
+CONTENT_PARAMS = ('min_scale_down', 'iou_threshold', 'max_neg', 'max_logos', 'placement_mode', 'bg_pyramid', 'compositing', 'output_format', 'aug_budget_ms', 'sprite_atlas_dir', 'resize_backend', 'procedural_backgrounds', 'procedural_size')
+
+
+def new_manifest(seed: int, params: dict) -> dict:
+    """Create an empty run manifest for a dataset."""
+    return {
+        'generator_version': __version__,
+        'seed': seed,
+        'params': {key: params[key] for key in CONTENT_PARAMS},
+        'batches': [],
+        'shards': [],
+    }
+
+
+def load_manifest(out_base: Path) -> dict:
+    """Load run manifest from out_base, or None if there is none."""
+    path = Path(out_base) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_manifest(out_base: Path, manifest: dict) -> None:
+    """Atomically write run manifest to out_base."""
+    path = Path(out_base) / MANIFEST_NAME
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+def check_params(manifest: dict, params: dict) -> None:
+    """Raise if content parameters differ from the manifest, warn on version change."""
+    diff = {
+        key: (manifest['params'].get(key), params[key])
+        for key in CONTENT_PARAMS
+        if manifest['params'].get(key) != params[key]
+    }
+    if diff:
+        raise ValueError(f"Parameters differ from manifest (manifest, requested): {diff}")
+    if manifest['generator_version'] != __version__:
+        print(f"Warning: manifest was written by generator {manifest['generator_version']}, running {__version__}")
+
+
+def total_images(manifest: dict) -> int:
+    """Number of images planned over all batches."""
+    return sum(batch['count'] for batch in manifest['batches'])
+
+
+def add_batch(manifest: dict, count: int, shard_size: int, class_targets: dict = None) -> list:
+    """Append a batch of count images after the existing ones and return its shards.
+
+    Splits are assigned 80/10/10 within each batch, so extending a dataset keeps
+    the overall split proportions. Shard ids continue from the existing shards.
+    ``class_targets`` ({cls: instances}) is stored for the class plan of the batch.
+    """
+    start = total_images(manifest)
+    batch_id = len(manifest['batches'])
+    manifest['batches'].append({
+        'start': start,
+        'count': count,
+        'class_targets': {str(cls): n for cls, n in class_targets.items()} if class_targets else None,
+    })
+
+    shards = []
+    for shard_start in range(start, start + count, shard_size):
+        shard = {
+            'id': len(manifest['shards']),
+            'batch': batch_id,
+            'start': shard_start,
+            'stop': min(shard_start + shard_size, start + count),
+            'done': False,
+        }
+        manifest['shards'].append(shard)
+        shards.append(shard)
+    return shards
+
+
+def pending_shards(manifest: dict) -> list:
+    """Shards that have not been completed yet."""
+    return [shard for shard in manifest['shards'] if not shard['done']]
+
+
+def mark_shard_done(manifest: dict, shard_id: int, images: list) -> None:
+    """Record a completed shard with per-image split and class counts."""
+    shard = manifest['shards'][shard_id]
+    shard['done'] = True
+    shard['images'] = images
+
+
+def dataset_summary(manifest: dict) -> tuple:
+    """Return (class_counts, split_counts) over all completed images."""
+    class_counts = {0: 0, 1: 0, 2: 0}
+    split_counts = {'train': 0, 'val': 0, 'test': 0}
+    for shard in manifest['shards']:
+        for image in shard.get('images', []):
+            split_counts[image['split']] += 1
+            for cls, count in enumerate(image['class_counts']):
+                class_counts[cls] += count
+    return class_counts, split_counts
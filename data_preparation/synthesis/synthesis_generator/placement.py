@@ -0,0 +1,123 @@
+import numpy as np
+
+
+def to_corners(boxes: np.ndarray) -> np.ndarray:
+    """Convert (N, 4) YOLO boxes (cx, cy, w, h) to corners (x1, y1, x2, y2)."""
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    half = boxes[:, 2:] / 2
+    return np.concatenate([boxes[:, :2] - half, boxes[:, :2] + half], axis=1)
+
+
+def iou_matrix(boxes1: np.ndarray, boxes2: np.ndarray) -> np.ndarray:
+    """Calculate (N, M) IoU matrix between two sets of YOLO boxes."""
+    a = to_corners(boxes1)[:, None, :]
+    b = to_corners(boxes2)[None, :, :]
+
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    union = area_a + area_b - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+def visibility(boxes: np.ndarray) -> np.ndarray:
+    """Fraction of each YOLO box area that lies inside the unit image frame."""
+    c = to_corners(boxes)
+    inside_w = np.clip(np.minimum(c[:, 2], 1.0) - np.maximum(c[:, 0], 0.0), 0, None)
+    inside_h = np.clip(np.minimum(c[:, 3], 1.0) - np.maximum(c[:, 1], 0.0), 0, None)
+    area = (c[:, 2] - c[:, 0]) * (c[:, 3] - c[:, 1])
+    return np.divide(inside_w * inside_h, area, out=np.zeros_like(area), where=area > 0)
+
+
+def sample_candidates(W: int, H: int, w: int, h: int, num_candidates: int) -> tuple:
+    """Sample top-left positions for a w x h sprite and their YOLO boxes."""
+    xs = np.random.randint(0, max(0, W - w) + 1, size=num_candidates)
+    ys = np.random.randint(0, max(0, H - h) + 1, size=num_candidates)
+    boxes = np.stack([
+        (xs + w / 2) / W,
+        (ys + h / 2) / H,
+        np.full(num_candidates, w / W),
+        np.full(num_candidates, h / H),
+    ], axis=1)
+    return xs, ys, boxes
+
+
+def find_placement(W: int, H: int, w: int, h: int, placed_bboxes: list, iou_threshold: float = 0.4, min_visibility: float = 0.8, num_candidates: int = 10):
+    """Find a position for a w x h sprite on a W x H image.
+
+    Samples a batch of candidates at once, checks visibility and the IoU matrix
+    against already placed boxes in one call and returns the first valid
+    candidate as (x, y, bbox), or None if none of them passes.
+    """
+    xs, ys, boxes = sample_candidates(W, H, w, h, num_candidates)
+
+    valid = visibility(boxes) >= min_visibility
+    if placed_bboxes:
+        valid &= iou_matrix(boxes, np.asarray(placed_bboxes)).max(axis=1) <= iou_threshold
+
+    idx = np.flatnonzero(valid)
+    if idx.size == 0:
+        return None
+    i = idx[0]
+    return int(xs[i]), int(ys[i]), tuple(float(v) for v in boxes[i])
+
+
+class OccupancyGrid:
+    """Occupancy map of placed sprites on a coarse grid of ``cell`` pixels.
+
+    Cells touched by a placed box are marked occupied. An integral image over the
+    grid gives, for every grid-aligned position at once, the occupied area a new
+    sprite would cover, so positions can be sampled only where space is free.
+    """
+
+    def __init__(self, W: int, H: int, cell: int = 8):
+        self.W = W
+        self.H = H
+        self.cell = cell
+        self.grid = np.zeros((-(-H // cell), -(-W // cell)), dtype=np.int32)
+
+    def mark(self, x: int, y: int, w: int, h: int) -> None:
+        """Mark cells covered by the box at (x, y) of size w x h as occupied."""
+        c = self.cell
+        self.grid[y // c:-(-(y + h) // c), x // c:-(-(x + w) // c)] = 1
+
+    def free_positions(self, w: int, h: int, max_overlap: float = 0.0) -> tuple:
+        """Top-left pixel positions where a w x h sprite fits inside the image and
+        at most ``max_overlap`` of its area lies on occupied cells."""
+        c = self.cell
+        nx = (self.W - w) // c + 1
+        ny = (self.H - h) // c + 1
+        if nx <= 0 or ny <= 0 or w <= 0 or h <= 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        gw = -(-w // c)
+        gh = -(-h // c)
+        integral = np.pad(self.grid.cumsum(axis=0).cumsum(axis=1), ((1, 0), (1, 0)))
+        occupied = (integral[gh:gh + ny, gw:gw + nx] - integral[:ny, gw:gw + nx]
+                    - integral[gh:gh + ny, :nx] + integral[:ny, :nx])
+
+        # Occupied cell area overestimates the true overlap, so the check is conservative
+        valid = occupied * (c * c) <= max_overlap * (w * h)
+        gy, gx = np.nonzero(valid)
+        return gx * c, gy * c
+
+
+def find_placement_grid(grid: OccupancyGrid, w: int, h: int, iou_threshold: float = 0.4):
+    """Sample a position for a w x h sprite among the free positions of the grid.
+
+    A position whose overlap with all occupied cells is at most ``iou_threshold``
+    of the sprite area has IoU <= ``iou_threshold`` with every placed box, and
+    being inside the image it is fully visible. Returns (x, y, bbox) or None if
+    the sprite fits nowhere.
+    """
+    xs, ys = grid.free_positions(w, h, max_overlap=iou_threshold)
+    if xs.size == 0:
+        return None
+    i = np.random.randint(xs.size)
+    x, y = int(xs[i]), int(ys[i])
+    W, H = grid.W, grid.H
+    return x, y, ((x + w / 2) / W, (y + h / 2) / H, w / W, h / H)
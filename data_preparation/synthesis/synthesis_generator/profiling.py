@@ -0,0 +1,155 @@
+import time
+from PIL import Image
+import numpy as np
+from .augmentations import apply_seeded_pipeline, get_background_aug_pipeline, get_neg_aug_pipeline, get_logo_aug_pipeline
+
+_PROFILED_CLASSES = {}
+
+
+def size_bucket(shape: tuple) -> int:
+    """Longer side of an image rounded up to a power of two (at least 64)."""
+    bucket = 64
+    while bucket < max(shape[:2]):
+        bucket *= 2
+    return bucket
+
+
+def _profiled_call(self, *args, **kwargs):
+    self._profile_fired = False
+    image = kwargs.get('image')
+    t0 = time.perf_counter()
+    result = super(type(self), self).__call__(*args, **kwargs)
+    if self._profile_fired:
+        size = size_bucket(image.shape) if image is not None else 0
+        self._profiler.record(self._profile_pipeline, type(self).__bases__[0].__name__, size, time.perf_counter() - t0)
+    return result
+
+
+def _profiled_apply_with_params(self, *args, **kwargs):
+    self._profile_fired = True
+    return super(type(self), self).apply_with_params(*args, **kwargs)
+
+
+def _profiled_class(cls: type) -> type:
+    """Subclass of a transform class that reports its wall time to the profiler."""
+    profiled = _PROFILED_CLASSES.get(cls)
+    if profiled is None:
+        profiled = type(f"Profiled{cls.__name__}", (cls,), {
+            '__call__': _profiled_call,
+            'apply_with_params': _profiled_apply_with_params,
+        })
+        _PROFILED_CLASSES[cls] = profiled
+    return profiled
+
+
+class TransformProfiler:
+    """Wall time of every transform that fires in albumentations pipelines.
+
+    ``wrap`` swaps the transforms of an ``A.Compose`` for profiled subclasses,
+    so the pipeline is called as before. Only calls where the transform was
+    actually applied are recorded, keyed by (pipeline, transform, size bucket
+    of the input image); the time includes data-dependent parameter sampling.
+    """
+
+    def __init__(self):
+        self.records = {}
+
+    def wrap(self, pipeline, name: str):
+        """Profile all transforms of pipeline under name and return the pipeline."""
+        for t in pipeline.transforms:
+            t.__class__ = _profiled_class(type(t))
+            t._profiler = self
+            t._profile_pipeline = name
+        return pipeline
+
+    def record(self, pipeline: str, transform: str, size: int, seconds: float) -> None:
+        key = (pipeline, transform, size)
+        entry = self.records.get(key)
+        if entry is None:
+            self.records[key] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def stats(self) -> list:
+        """Return records as a list of dicts."""
+        return [
+            {'pipeline': pipeline, 'transform': transform, 'size': size, 'calls': calls, 'seconds': seconds, 'max_seconds': max_seconds}
+            for (pipeline, transform, size), (calls, seconds, max_seconds) in self.records.items()
+        ]
+
+
+def merge_profiles(profiles: list) -> list:
+    """Merge TransformProfiler.stats() lists, e.g. from several workers."""
+    merged = {}
+    for stats in profiles:
+        for entry in stats:
+            key = (entry['pipeline'], entry['transform'], entry['size'])
+            total = merged.get(key)
+            if total is None:
+                merged[key] = dict(entry)
+            else:
+                total['calls'] += entry['calls']
+                total['seconds'] += entry['seconds']
+                total['max_seconds'] = max(total['max_seconds'], entry['max_seconds'])
+    return list(merged.values())
+
+
+def format_profile_table(stats: list) -> str:
+    """Format profile stats as a text table, slowest transforms of each pipeline first."""
+    pipeline_totals = {}
+    for entry in stats:
+        pipeline_totals[entry['pipeline']] = pipeline_totals.get(entry['pipeline'], 0.0) + entry['seconds']
+
+    lines = [f"{'pipeline':<10} {'transform':<26} {'size':>6} {'calls':>7} {'total s':>9} {'mean ms':>9} {'max ms':>9} {'share':>7}"]
+    for entry in sorted(stats, key=lambda e: (e['pipeline'], -e['seconds'])):
+        share = entry['seconds'] / max(pipeline_totals[entry['pipeline']], 1e-12)
+        lines.append(
+            f"{entry['pipeline']:<10} {entry['transform']:<26} {'<=' + str(entry['size']):>6} {entry['calls']:>7} "
+            f"{entry['seconds']:>9.2f} {entry['seconds'] / entry['calls'] * 1000:>9.2f} {entry['max_seconds'] * 1000:>9.2f} {share:>7.1%}"
+        )
+    return "\n".join(lines)
+
+
+def synthetic_input(size: int, channels: int = 3, rng: np.random.Generator = None) -> np.ndarray:
+    """Smooth random uint8 image with longer side size (4:3), RGBA with an opaque ellipse if channels == 4."""
+    if rng is None:
+        rng = np.random.default_rng(0)
+    W, H = size, max(1, size * 3 // 4)
+    coarse = rng.integers(0, 256, (max(2, H // 16), max(2, W // 16), 3), dtype=np.uint8)
+    rgb = np.asarray(Image.fromarray(coarse).resize((W, H), Image.BILINEAR))
+    noise = rng.integers(-8, 9, rgb.shape)
+    rgb = np.clip(rgb + noise, 0, 255).astype(np.uint8)
+    if channels == 3:
+        return rgb
+    yy, xx = np.mgrid[0:H, 0:W]
+    inside = ((xx - W / 2) / (W / 2)) ** 2 + ((yy - H / 2) / (H / 2)) ** 2 <= 1.0
+    alpha = np.where(inside, 255, 0).astype(np.uint8)
+    return np.dstack([rgb, alpha])
+
+
+def benchmark_pipelines(sizes: tuple = (128, 256, 512, 1024, 1920), iterations: int = 20, always_apply: bool = False, seed: int = 0) -> list:
+    """Run background, distractor and logo pipelines on synthetic inputs of several sizes.
+
+    Backgrounds get RGB inputs, distractors and logos RGBA, as in the generator.
+    With ``always_apply`` every transform fires on every call, which gives the
+    per-call cost regardless of the configured probabilities. Returns profile stats.
+    """
+    profiler = TransformProfiler()
+    pipelines = [
+        ('background', get_background_aug_pipeline(), 3),
+        ('neg', get_neg_aug_pipeline(), 4),
+        ('logo', get_logo_aug_pipeline(), 4),
+    ]
+    rng = np.random.default_rng(seed)
+    for name, pipeline, channels in pipelines:
+        if always_apply:
+            for t in pipeline.transforms:
+                t.p = 1.0
+        profiler.wrap(pipeline, name)
+        for size in sizes:
+            image = synthetic_input(size, channels, rng)
+            for i in range(iterations):
+                apply_seeded_pipeline(pipeline, seed + i, image=image)
+    return profiler.stats()
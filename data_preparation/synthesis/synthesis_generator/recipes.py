@@ -0,0 +1,151 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from PIL import Image
+import numpy as np
+from tqdm import tqdm
+from .asset_cache import AssetCache
+from .background_cache import BackgroundCache
+from .augmentations import apply_seeded_pipeline, get_background_aug_pipeline, get_neg_aug_pipeline, get_logo_aug_pipeline
+from .compositing import alpha_blend
+from .background_utils import synthesize_background
+from .budget import replay_pipeline
+from .resize import resize_image
+from .generator import setup_output_dirs
+
+
+def load_recipes(recipes_path: Path) -> list:
+    """Load render recipes from a JSONL file."""
+    with open(recipes_path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _sprite(asset: Image.Image, item: dict, W: int, H: int, resize_backend: str = 'lanczos') -> Image.Image:
+    """Resize and rotate a sprite to its recipe geometry on a W x H image."""
+    nw = max(1, round(item['w'] * W))
+    nh = max(1, round(item['h'] * H))
+    return resize_image(asset, (nw, nh), resize_backend).rotate(item['angle'], expand=True)
+
+
+def render_recipe(recipe: dict, bg_aug_pipeline, neg_aug_pipeline, logo_aug_pipeline, imgsz: int = None, asset_cache: AssetCache = None, background_caches: dict = None) -> tuple:
+    """Re-render a scene from its recipe without placement search.
+
+    ``imgsz`` sets the longer side of the output image (default: the recorded
+    size). Sprite sizes and positions are stored relative to the image and
+    augmentations are replayed from their seeds (with the recorded
+    ``aug_plan`` of budgeted calls, see ``budget.PlannedPipeline``) and resizes
+    use the recorded ``resize_backend``, so at the recorded size the scene is
+    reproduced exactly.
+    Procedural backgrounds are re-synthesized from their seed. Backgrounds
+    generated from a pyramid are loaded through a ``BackgroundCache`` with the
+    recorded levels, kept in ``background_caches`` across calls.
+    Recipes of sprite atlas scenes (``replayable: False``) raise ValueError.
+    Returns (uint8 canvas, [(cls, bbox), ...]).
+    """
+    if not recipe.get('replayable', True):
+        raise ValueError(f"Recipe of {recipe.get('image')} was rendered with a sprite atlas and cannot be replayed")
+    if asset_cache is None:
+        asset_cache = AssetCache()
+    if background_caches is None:
+        background_caches = {}
+    background = recipe['background']
+    W_rec, H_rec = background['size']
+    factor = imgsz / max(W_rec, H_rec) if imgsz else 1.0
+    W, H = max(1, round(W_rec * factor)), max(1, round(H_rec * factor))
+
+    resize_backend = recipe.get('resize_backend', 'lanczos')
+    if background.get('procedural_seed') is not None:
+        bg = Image.fromarray(synthesize_background(W_rec, H_rec, np.random.default_rng(background['procedural_seed'])))
+    elif background.get('pyramid_levels'):
+        key = (tuple(background['pyramid_levels']), resize_backend)
+        if key not in background_caches:
+            background_caches[key] = BackgroundCache(key[0], resize_backend=resize_backend)
+        bg = background_caches[key].load(background['path'], background['scale_down'])
+    else:
+        bg = Image.open(background['path']).convert("RGB")
+    if bg.size != (W, H):
+        bg = resize_image(bg, (W, H), resize_backend)
+    canvas = apply_seeded_pipeline(replay_pipeline(bg_aug_pipeline, background.get('aug_plan')), background['aug_seed'], image=np.array(bg))['image']
+    if not canvas.flags.writeable:
+        canvas = canvas.copy()
+
+    for item in recipe['distractors']:
+        obj_arr = np.array(asset_cache.get(item['path']))
+        obj = Image.fromarray(apply_seeded_pipeline(replay_pipeline(neg_aug_pipeline, item.get('aug_plan')), item['aug_seed'], image=obj_arr)['image'])
+        obj_t = _sprite(obj, item, W, H, resize_backend)
+        alpha_blend(canvas, np.asarray(obj_t), round(item['x'] * W), round(item['y'] * H))
+
+    bboxes_info = []
+    for item in recipe['logos']:
+        ref_t = _sprite(asset_cache.get_image(item['path']), item, W, H, resize_backend)
+        auged_ref = apply_seeded_pipeline(replay_pipeline(logo_aug_pipeline, item.get('aug_plan')), item['aug_seed'], image=np.array(ref_t))['image']
+        x, y = round(item['x'] * W), round(item['y'] * H)
+        alpha_blend(canvas, auged_ref, x, y)
+        bbox = ((x + ref_t.width / 2) / W, (y + ref_t.height / 2) / H, ref_t.width / W, ref_t.height / H)
+        bboxes_info.append((item['cls'], bbox))
+
+    return canvas, bboxes_info
+
+
+# Per-process state for recipe workers
+_RECIPE_CONTEXT = {}
+
+
+def _init_recipe_worker(context: dict) -> None:
+    """Initialize recipe worker state: output settings, pipelines and asset cache."""
+    _RECIPE_CONTEXT.clear()
+    _RECIPE_CONTEXT.update(context)
+    _RECIPE_CONTEXT['asset_cache'] = AssetCache()
+    _RECIPE_CONTEXT['background_caches'] = {}
+    _RECIPE_CONTEXT['bg_aug_pipeline'] = get_background_aug_pipeline()
+    _RECIPE_CONTEXT['neg_aug_pipeline'] = get_neg_aug_pipeline()
+    _RECIPE_CONTEXT['logo_aug_pipeline'] = get_logo_aug_pipeline()
+
+
+def _render_recipe_chunk(recipes: list) -> int:
+    """Render and save a chunk of recipes, returning the number of images."""
+    ctx = _RECIPE_CONTEXT
+    out_base = ctx['out_base']
+    for recipe in recipes:
+        canvas, bboxes_info = render_recipe(
+            recipe, ctx['bg_aug_pipeline'], ctx['neg_aug_pipeline'], ctx['logo_aug_pipeline'],
+            imgsz=ctx['imgsz'], asset_cache=ctx['asset_cache'], background_caches=ctx['background_caches']
+        )
+        fname = recipe['image']
+        split = recipe['split']
+        Image.fromarray(canvas).save(out_base / 'images' / split / fname, quality=ctx['quality'])
+
+        lbl_path = out_base / 'labels' / split / fname.replace('.jpg', '.txt')
+        with open(lbl_path, 'w') as f:
+            for cls_label, bbox in bboxes_info:
+                cx, cy, bw, bh = bbox
+                f.write(f"{cls_label} {cx:.6f} {cy:.6f} {bw:.6f} {bh:.6f}\n")
+    return len(recipes)
+
+
+def render_from_recipes(recipes_path: Path, out_base: Path, imgsz: int = None, quality: int = 90, workers: int = 1, chunk_size: int = 50) -> None:
+    """Re-render a synthetic dataset from recipes.jsonl at another resolution or JPEG quality.
+
+    File names and splits are taken from the recipes; chunks of recipes are
+    spread over ``workers`` processes.
+    """
+    recipes = load_recipes(recipes_path)
+    skipped = [recipe for recipe in recipes if not recipe.get('replayable', True)]
+    if skipped:
+        raise ValueError(f"{len(skipped)} of {len(recipes)} recipes in {recipes_path} were rendered with a sprite atlas and cannot be replayed")
+    out_base = Path(out_base)
+    setup_output_dirs(out_base)
+
+    context = {'out_base': out_base, 'imgsz': imgsz, 'quality': quality}
+    chunks = [recipes[i:i + chunk_size] for i in range(0, len(recipes), chunk_size)]
+    with tqdm(total=len(recipes), desc=f"Rendering from recipes ({workers} workers)", unit="img") as pbar:
+        if workers <= 1:
+            _init_recipe_worker(context)
+            for chunk in chunks:
+                pbar.update(_render_recipe_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_recipe_worker, initargs=(context,)) as executor:
+                for count in executor.map(_render_recipe_chunk, chunks):
+                    pbar.update(count)
+
+    print(f"Rendered {len(recipes)} images from {recipes_path} to {out_base} (imgsz={imgsz or 'original'}, quality={quality})")
@@ -0,0 +1,48 @@
+import numpy as np
+
+NUM_CLASSES = 3
+
+
+def balanced_targets(N: int, max_logos: int = 10, num_classes: int = NUM_CLASSES) -> dict:
+    """Equal per-class instance targets with the expected logo count of uniform 1..max_logos per image."""
+    total = round(N * (1 + max_logos) / 2)
+    base, rest = divmod(total, num_classes)
+    return {cls: base + (1 if cls < rest else 0) for cls in range(num_classes)}
+
+
+def plan_class_composition(N: int, targets: dict, max_logos: int = 10, seed=0) -> list:
+    """Plan the classes of the logos in each of N images so that per-class totals equal targets exactly.
+
+    Logo counts per image start from a uniform draw in [1, max_logos] and are
+    nudged by one at a time until they sum to the total target; class labels are
+    then shuffled and dealt out in order. ``seed`` is an int or a sequence of
+    ints for ``np.random.default_rng``. Returns one list of classes per image.
+    """
+    targets = {int(cls): int(count) for cls, count in targets.items()}
+    total = sum(targets.values())
+    if not N <= total <= N * max_logos:
+        raise ValueError(f"Cannot place {total} logos in {N} images with 1..{max_logos} logos each")
+
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(1, max_logos + 1, N)
+    diff = total - int(counts.sum())
+    while diff != 0:
+        step = 1 if diff > 0 else -1
+        adjustable = np.flatnonzero(counts < max_logos) if step > 0 else np.flatnonzero(counts > 1)
+        chosen = rng.choice(adjustable, min(abs(diff), len(adjustable)), replace=False)
+        counts[chosen] += step
+        diff -= step * len(chosen)
+
+    labels = np.concatenate([np.full(count, cls) for cls, count in sorted(targets.items())]).astype(int)
+    rng.shuffle(labels)
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    return [labels[bounds[i]:bounds[i + 1]].tolist() for i in range(N)]
+
+
+def plan_totals(plan: list, num_classes: int = NUM_CLASSES) -> dict:
+    """Per-class instance counts of a plan (or a slice of it)."""
+    totals = {cls: 0 for cls in range(num_classes)}
+    for classes in plan:
+        for cls in classes:
+            totals[cls] += 1
+    return totals
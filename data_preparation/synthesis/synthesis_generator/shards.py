@@ -0,0 +1,199 @@
+import io
+import json
+import os
+import tarfile
+from pathlib import Path
+from PIL import Image
+import numpy as np
+
+TAR_BLOCK = 512
+
+
+class ShardWriter:
+    """Pack encoded images and YOLO labels into tar shards with an offset index.
+
+    Samples are appended to ``{prefix}-{n:05d}.tar`` in ``out_dir``; a new shard
+    is started after ``max_count`` samples. Every tar gets a sidecar
+    ``.idx.json`` with the byte offsets and sizes of each image and label, so
+    samples can be read back with a single seek. Tars and indexes are written
+    under temporary names and renamed on close, so an interrupted run never
+    leaves a half-written shard behind.
+    """
+
+    def __init__(self, out_dir: Path, prefix: str, max_count: int = 1000):
+        self.out_dir = Path(out_dir)
+        self.prefix = prefix
+        self.max_count = max_count
+        self.shard_index = 0
+        self.paths = []
+        self._tar = None
+        self._tar_path = None
+        self._records = []
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+
+    def _add_member(self, name: str, data: bytes) -> tuple:
+        """Append a file to the current tar and return (data offset, size)."""
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        self._tar.addfile(info, io.BytesIO(data))
+        padded = -(-len(data) // TAR_BLOCK) * TAR_BLOCK
+        return self._tar.offset - padded, len(data)
+
+    def write(self, fname: str, image_bytes: bytes, label_text: str) -> None:
+        """Append one sample (encoded image and label file contents)."""
+        if self._tar is None:
+            self._tar_path = self.out_dir / f"{self.prefix}-{self.shard_index:05d}.tar"
+            self._tar = tarfile.open(self._tar_path.with_suffix('.tar.tmp'), 'w', format=tarfile.USTAR_FORMAT)
+        offset, size = self._add_member(fname, image_bytes)
+        label_offset, label_size = self._add_member(Path(fname).with_suffix('.txt').name, label_text.encode())
+        self._records.append({
+            'image': fname,
+            'offset': offset,
+            'size': size,
+            'label_offset': label_offset,
+            'label_size': label_size,
+        })
+        if len(self._records) >= self.max_count:
+            self._finish_shard()
+
+    def _finish_shard(self) -> None:
+        """Close the current tar and publish it together with its index."""
+        self._tar.close()
+        os.replace(self._tar_path.with_suffix('.tar.tmp'), self._tar_path)
+        idx_path = index_path(self._tar_path)
+        tmp_path = idx_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'tar': self._tar_path.name, 'samples': self._records}, f)
+        os.replace(tmp_path, idx_path)
+        self.paths.append(self._tar_path)
+        self.shard_index += 1
+        self._tar = None
+        self._records = []
+
+    def close(self) -> list:
+        """Finish the last shard and return paths of all written tars."""
+        if self._tar is not None:
+            self._finish_shard()
+        return self.paths
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._tar is not None:
+            self._tar.close()
+
+
+def index_path(tar_path: Path) -> Path:
+    """Path of the offset index for a tar shard."""
+    tar_path = Path(tar_path)
+    return tar_path.with_name(tar_path.stem + '.idx.json')
+
+
+def parse_labels(label_text: str) -> np.ndarray:
+    """Parse YOLO label text into a float32 array of ``cls cx cy w h`` rows."""
+    rows = [line.split() for line in label_text.splitlines() if line.strip()]
+    return np.array(rows, dtype=np.float32).reshape(-1, 5)
+
+
+class ShardReader:
+    """Random access to the samples of one split of a packed dataset.
+
+    Reads the ``.idx.json`` indexes in ``packed_dir/split`` and serves samples by
+    seeking into the tars, without unpacking. ``read`` returns raw bytes,
+    indexing returns ``(image, labels)`` arrays like ``iter_synthetic_samples``.
+    """
+
+    def __init__(self, packed_dir: Path, split: str):
+        self.split_dir = Path(packed_dir) / split
+        self.samples = []
+        for idx_path in sorted(self.split_dir.glob('*.idx.json')):
+            with open(idx_path, 'r') as f:
+                index = json.load(f)
+            tar_path = self.split_dir / index['tar']
+            self.samples.extend((tar_path, record) for record in index['samples'])
+        self._files = {}
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def names(self) -> list:
+        """Image file names in shard order."""
+        return [record['image'] for _, record in self.samples]
+
+    def _read_at(self, tar_path: Path, offset: int, size: int) -> bytes:
+        f = self._files.get(tar_path)
+        if f is None:
+            f = self._files[tar_path] = open(tar_path, 'rb')
+        f.seek(offset)
+        return f.read(size)
+
+    def read(self, i: int) -> tuple:
+        """Return (file name, encoded image bytes, label text) of sample i."""
+        tar_path, record = self.samples[i]
+        image_bytes = self._read_at(tar_path, record['offset'], record['size'])
+        label_text = self._read_at(tar_path, record['label_offset'], record['label_size']).decode()
+        return record['image'], image_bytes, label_text
+
+    def __getitem__(self, i: int) -> tuple:
+        _, image_bytes, label_text = self.read(i)
+        image = np.asarray(Image.open(io.BytesIO(image_bytes)).convert('RGB'))
+        return image, parse_labels(label_text)
+
+    def unpack(self, out_base: Path) -> int:
+        """Write missing samples to ``images/<split>`` and ``labels/<split>`` and return their number."""
+        out_base = Path(out_base)
+        split = self.split_dir.name
+        images_dir = out_base / 'images' / split
+        labels_dir = out_base / 'labels' / split
+        images_dir.mkdir(parents=True, exist_ok=True)
+        labels_dir.mkdir(parents=True, exist_ok=True)
+        written = 0
+        for i, (_, record) in enumerate(self.samples):
+            img_path = images_dir / record['image']
+            if img_path.exists():
+                continue
+            fname, image_bytes, label_text = self.read(i)
+            (labels_dir / Path(fname).with_suffix('.txt').name).write_text(label_text)
+            img_path.write_bytes(image_bytes)
+            written += 1
+        return written
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+
+def pack_dataset(out_base: Path, packed_dir: Path = None, max_count: int = 1000, splits: list = ['train', 'val', 'test']) -> dict:
+    """Pack an ``images/``/``labels/`` dataset into tar shards of max_count samples per split.
+
+    Returns the number of packed samples per split.
+    """
+    out_base = Path(out_base)
+    packed_dir = Path(packed_dir) if packed_dir else out_base / 'packed'
+    counts = {}
+    for split in splits:
+        images = sorted((out_base / 'images' / split).glob('*.jpg'))
+        with ShardWriter(packed_dir / split, split, max_count=max_count) as writer:
+            for img_path in images:
+                lbl_path = out_base / 'labels' / split / img_path.with_suffix('.txt').name
+                label_text = lbl_path.read_text() if lbl_path.exists() else ''
+                writer.write(img_path.name, img_path.read_bytes(), label_text)
+        counts[split] = len(images)
+    return counts
+
+
+def unpack_shards(packed_dir: Path, out_base: Path, splits: list = ['train', 'val', 'test']) -> dict:
+    """Unpack tar shards into the Ultralytics ``images/``/``labels/`` layout, skipping existing files.
+
+    Returns the number of written samples per split.
+    """
+    counts = {}
+    for split in splits:
+        reader = ShardReader(packed_dir, split)
+        counts[split] = reader.unpack(out_base)
+        reader.close()
+    return counts
@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from PIL import Image
+import numpy as np
+
+# Asset offsets are aligned for cache-friendly row access
+ALIGN = 64
+
+
+def _decoded_shape(path: str, mode: str) -> tuple:
+    """(H, W, C) of an asset decoded to mode, from the image header only."""
+    with Image.open(path) as img:
+        w, h = img.size
+    return (h, w, len(mode))
+
+
+class SharedAssetPool:
+    """Decoded assets in one ``multiprocessing.shared_memory`` segment.
+
+    ``create`` decodes every asset once in the parent process; the pool pickles
+    to just the segment name and offset index, so worker processes attach to
+    the same segment and ``get`` returns read-only zero-copy views. Memory for
+    pooled assets no longer grows with the number of workers. The creating
+    process must call ``unlink`` when the workers are done.
+    """
+
+    def __init__(self, name: str, index: dict, nbytes: int):
+        self.name = name
+        self.index = index
+        self.nbytes = nbytes
+        self.hits = 0
+        self._shm = None
+        self._views = {}
+
+    @classmethod
+    def create(cls, groups: list, max_bytes: int, threads: int = None) -> 'SharedAssetPool':
+        """Decode assets into a new segment of at most max_bytes.
+
+        ``groups`` is a list of (paths, mode) in priority order, e.g.
+        [(crops, 'RGBA'), (distractors, 'RGBA'), (backgrounds, 'RGB')]; assets
+        that do not fit the budget are left out and loaded from disk as before.
+        Decoding runs on ``threads`` threads (default: one per CPU).
+        """
+        index = {}
+        offset = 0
+        for paths, mode in groups:
+            for path in paths:
+                shape = _decoded_shape(path, mode)
+                size = int(np.prod(shape))
+                if offset + size > max_bytes:
+                    continue
+                index[str(path)] = (offset, shape, mode)
+                offset += -(-size // ALIGN) * ALIGN
+
+        shm = shared_memory.SharedMemory(create=True, size=max(1, offset))
+        pool = cls(shm.name, index, offset)
+        pool._shm = shm
+
+        def decode(item):
+            path, (start, shape, mode) = item
+            dst = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=start)
+            with Image.open(path) as img:
+                dst[...] = np.asarray(img.convert(mode))
+
+        with ThreadPoolExecutor(threads) as executor:
+            list(executor.map(decode, index.items()))
+        return pool
+
+    def __getstate__(self) -> dict:
+        return {'name': self.name, 'index': self.index, 'nbytes': self.nbytes}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state['name'], state['index'], state['nbytes'])
+
+    def _attach(self) -> None:
+        try:
+            self._shm = shared_memory.SharedMemory(name=self.name, track=False)  # Python 3.13+
+        except TypeError:
+            self._shm = shared_memory.SharedMemory(name=self.name)
+            # Otherwise the resource tracker unlinks the segment when this worker exits
+            resource_tracker.unregister(self._shm._name, 'shared_memory')
+
+    def __contains__(self, path) -> bool:
+        return str(path) in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get(self, path) -> np.ndarray:
+        """Read-only view of a pooled asset (RGBA or RGB uint8), or None if it is not pooled."""
+        key = str(path)
+        arr = self._views.get(key)
+        if arr is None:
+            entry = self.index.get(key)
+            if entry is None:
+                return None
+            if self._shm is None:
+                self._attach()
+            start, shape, _ = entry
+            arr = np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf, offset=start)
+            arr.flags.writeable = False
+            self._views[key] = arr
+        self.hits += 1
+        return arr
+
+    def close(self) -> None:
+        """Detach from the segment; views still referenced elsewhere keep the mapping alive."""
+        self._views.clear()
+        if self._shm is not None:
+            try:
+                self._shm.close()
+            except BufferError:
+                pass
+            self._shm = None
+
+    def unlink(self) -> None:
+        """Close and remove the segment (creating process only)."""
+        shm = self._shm or shared_memory.SharedMemory(name=self.name)
+        self.close()
+        shm.unlink()
+
+    def stats(self) -> dict:
+        return {'assets': len(self.index), 'bytes': self.nbytes, 'hits': self.hits}
@@ -0,0 +1,143 @@
+import json
+import os
+import random
+from pathlib import Path
+from PIL import Image
+import numpy as np
+from .augmentations import apply_seeded_pipeline
+
+INDEX_NAME = "atlas.json"
+DATA_NAME = "atlas.bin"
+
+
+def asset_key(path) -> str:
+    """Atlas key of an asset: parent directory and file name."""
+    path = Path(path)
+    return f"{path.parent.name}/{path.name}"
+
+
+def width_levels(min_width: int, max_width: int, ratio: float = 1.25) -> list:
+    """Geometric ladder of sprite widths from min_width to max_width."""
+    widths = []
+    width = float(min_width)
+    while width < max_width:
+        widths.append(int(round(width)))
+        width *= ratio
+    widths.append(int(max_width))
+    return sorted(set(widths))
+
+
+def angle_levels(max_angle: float, step: float) -> list:
+    """Quantized rotation angles in [-max_angle, max_angle] including 0."""
+    n = int(max_angle // step)
+    return [float(k * step) for k in range(-n, n + 1)]
+
+
+def build_sprite_atlas(groups: list, atlas_dir: Path, seed: int = 0) -> dict:
+    """Pre-render assets at quantized widths and rotations into a memory-mappable atlas.
+
+    ``groups`` is a list of dicts with ``paths`` (RGBA assets), ``widths``,
+    ``angles`` and optionally ``variants`` and ``aug_pipeline``: variant 0 is
+    the asset itself, variants 1.. are the asset passed through the pipeline
+    (seeded) before resizing. Sprites keep the asset's aspect ratio and are
+    stored back to back in ``atlas.bin`` with their offsets and shapes in
+    ``atlas.json``. Returns the index.
+    """
+    atlas_dir = Path(atlas_dir)
+    atlas_dir.mkdir(parents=True, exist_ok=True)
+    data_tmp = atlas_dir / (DATA_NAME + ".tmp")
+
+    assets = {}
+    offset = 0
+    with open(data_tmp, 'wb') as f:
+        for group in groups:
+            variants = max(1, group.get('variants', 1))
+            for path in group['paths']:
+                asset = Image.open(path).convert("RGBA")
+                entries = []
+                for variant in range(variants):
+                    base = asset
+                    if variant > 0:
+                        aug_seed = (seed * 1000003 + len(assets) * 1009 + variant) % 2**32
+                        base = Image.fromarray(apply_seeded_pipeline(group['aug_pipeline'], aug_seed, image=np.array(asset))['image'])
+                    for width in group['widths']:
+                        height = max(1, round(width * asset.height / asset.width))
+                        resized = base.resize((width, height), Image.LANCZOS)
+                        for angle in group['angles']:
+                            sprite = np.ascontiguousarray(np.asarray(resized.rotate(angle, expand=True)))
+                            f.write(sprite.tobytes())
+                            entries.append({'variant': variant, 'width': width, 'height': height, 'angle': angle,
+                                            'offset': offset, 'shape': list(sprite.shape)})
+                            offset += sprite.nbytes
+                assets[asset_key(path)] = {
+                    'widths': group['widths'],
+                    'angles': group['angles'],
+                    'variants': variants,
+                    'entries': entries,
+                }
+
+    index = {'bytes': offset, 'assets': assets}
+    os.replace(data_tmp, atlas_dir / DATA_NAME)
+    index_tmp = atlas_dir / (INDEX_NAME + ".tmp")
+    with open(index_tmp, 'w') as f:
+        json.dump(index, f)
+    os.replace(index_tmp, atlas_dir / INDEX_NAME)
+    return index
+
+
+class SpriteAtlas:
+    """Read-only, memory-mapped sprite atlas built by ``build_sprite_atlas``.
+
+    ``sample`` returns the pre-rendered sprite nearest to the requested width
+    (in log scale) and angle, so placement needs no resize, rotation or, with
+    photometric variants, augmentation at runtime. Worker processes share the
+    atlas pages through the OS page cache.
+
+    The atlas changes the sprite distribution, not only speed: sprites keep the
+    asset's aspect ratio, while runtime sprites take their width from the canvas
+    and their height from the asset (``nw = int(W * scale)``,
+    ``nh = int(ref.height * scale)``); sizes and angles are quantized, and
+    single-variant distractors are augmented after resize and rotation instead
+    of before. Recipes of atlas scenes are therefore marked non-replayable.
+    """
+
+    def __init__(self, atlas_dir: Path):
+        atlas_dir = Path(atlas_dir)
+        with open(atlas_dir / INDEX_NAME, 'r') as f:
+            index = json.load(f)
+        self.data = np.memmap(atlas_dir / DATA_NAME, dtype=np.uint8, mode='r', shape=(max(1, index['bytes']),))
+        self.assets = {}
+        for key, asset in index['assets'].items():
+            lookup = {(entry['variant'], entry['width'], entry['angle']): entry for entry in asset['entries']}
+            self.assets[key] = {**asset, 'lookup': lookup, 'log_widths': np.log(asset['widths'])}
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, path) -> bool:
+        return asset_key(path) in self.assets
+
+    def variants(self, path) -> int:
+        """Number of stored variants of an asset (1 means no photometric variants)."""
+        return self.assets[asset_key(path)]['variants']
+
+    def sample(self, path, width: float, angle: float, variant: int = None) -> tuple:
+        """Return (read-only RGBA sprite, entry) nearest to width and angle, or (None, None) if absent.
+
+        ``variant`` defaults to a random stored variant.
+        """
+        asset = self.assets.get(asset_key(path))
+        if asset is None:
+            self.misses += 1
+            return None, None
+        self.hits += 1
+        width_idx = int(np.argmin(np.abs(asset['log_widths'] - np.log(max(width, 1)))))
+        near_angle = min(asset['angles'], key=lambda a: abs(a - angle))
+        if variant is None:
+            variant = random.randrange(asset['variants']) if asset['variants'] > 1 else 0
+        entry = asset['lookup'][(variant, asset['widths'][width_idx], near_angle)]
+        h, w, c = entry['shape']
+        sprite = self.data[entry['offset']:entry['offset'] + h * w * c].reshape(h, w, c)
+        return sprite, entry
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'assets': len(self.assets), 'bytes': int(self.data.nbytes)}
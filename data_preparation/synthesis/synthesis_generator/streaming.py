@@ -0,0 +1,92 @@
+import itertools
+import random
+from pathlib import Path
+import numpy as np
+from .asset_cache import AssetCache
+from .augmentations import get_background_aug_pipeline, get_neg_aug_pipeline, get_logo_aug_pipeline
+from .background_cache import BackgroundCache
+from .resize import validate_resize_backend
+from .generator import get_shard_seed, load_backgrounds, load_background_objects, load_crops_by_class, render_scene
+
+
+def get_worker_split(worker_id: int = None, num_workers: int = None) -> tuple:
+    """Return (worker_id, num_workers), from torch DataLoader worker info if available."""
+    if worker_id is not None and num_workers is not None:
+        return worker_id, num_workers
+    try:
+        from torch.utils.data import get_worker_info
+    except ImportError:
+        return 0, 1
+    info = get_worker_info()
+    if info is None:
+        return 0, 1
+    return info.id, info.num_workers
+
+
+def iter_synthetic_samples(
+    crops_dir: Path,
+    bg_dir: Path,
+    bg_objects_dir: Path = None,
+    num_samples: int = None,
+    seed: int = 0,
+    min_scale_down: float = 0.5,
+    iou_threshold: float = 0.4,
+    max_neg: int = 15,
+    max_logos: int = 10,
+    placement_mode: str = 'random',
+    asset_cache_mb: int = 512,
+    bg_pyramid: bool = False,
+    resize_backend: str = 'lanczos',
+    procedural_backgrounds: float = 0.0,
+    procedural_size: tuple = (1920, 1920),
+    worker_id: int = None,
+    num_workers: int = None
+):
+    """Yield synthetic samples in memory as (image, labels) without touching disk.
+
+    ``image`` is an RGB uint8 array (H, W, 3), ``labels`` a float32 array (K, 5)
+    of ``cls cx cy w h`` rows in YOLO format. Sample ``i`` is rendered with a seed
+    derived from ``seed`` and ``i`` and belongs to worker ``i % num_workers``, so
+    DataLoader workers produce disjoint parts of the same deterministic stream.
+    The stream is infinite when ``num_samples`` is None. ``resize_backend`` is
+    'lanczos', 'pil' or 'opencv' (see ``resize.resize_image``). A
+    ``procedural_backgrounds`` share of backgrounds is synthesized on the fly
+    (see ``render_scene``); with 1.0 ``bg_dir`` may be empty.
+    """
+    worker_id, num_workers = get_worker_split(worker_id, num_workers)
+    validate_resize_backend(resize_backend)
+
+    crops_by_class = load_crops_by_class(Path(crops_dir))
+    bgs = load_backgrounds(Path(bg_dir)) if bg_dir else []
+    bg_objects = load_background_objects(Path(bg_objects_dir)) if bg_objects_dir and Path(bg_objects_dir).exists() else []
+
+    if not all(len(crops) > 0 for crops in crops_by_class.values()) or not (bgs or procedural_backgrounds):
+        raise ValueError("No crops or backgrounds found.")
+
+    bg_aug_pipeline = get_background_aug_pipeline()
+    neg_aug_pipeline = get_neg_aug_pipeline()
+    logo_aug_pipeline = get_logo_aug_pipeline()
+    asset_cache = AssetCache(asset_cache_mb * 1024 * 1024)
+    background_cache = BackgroundCache(resize_backend=resize_backend) if bg_pyramid else None
+
+    indices = itertools.count(worker_id, num_workers) if num_samples is None else range(worker_id, num_samples, num_workers)
+    for i in indices:
+        sample_seed = get_shard_seed(seed, i)
+        random.seed(sample_seed)
+        np.random.seed(sample_seed)
+
+        # Re-render until at least one logo is placed
+        bboxes_info = []
+        while not bboxes_info:
+            image, bboxes_info = render_scene(
+                bgs, crops_by_class, bg_objects,
+                bg_aug_pipeline, neg_aug_pipeline, logo_aug_pipeline,
+                min_scale_down, iou_threshold, max_neg,
+                asset_cache=asset_cache, placement_mode=placement_mode,
+                background_cache=background_cache, compositing='numpy', max_logos=max_logos,
+                resize_backend=resize_backend, procedural_backgrounds=procedural_backgrounds,
+                procedural_size=procedural_size
+            )
+
+        labels = np.array([(cls, *bbox) for cls, bbox in bboxes_info], dtype=np.float32)
+        yield image, labels
@@ -0,0 +1,94 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+import numpy as np
+
+# Per-image generation stages, in pipeline order
+STAGES = ('bg_load', 'resize', 'bg_aug', 'distractors', 'logos', 'encode', 'write')
+
+PERCENTILES = (50, 90, 99)
+
+
+@contextmanager
+def stage_timer(timings: dict, stage: str):
+    """Add the wall time of the block in ms to timings[stage]; no-op when timings is None."""
+    if timings is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + (time.perf_counter() - t0) * 1000
+
+
+def timed(timings: dict, stage: str, fn, *args, **kwargs):
+    """Call fn(*args, **kwargs) under stage_timer, e.g. as a writer task."""
+    with stage_timer(timings, stage):
+        return fn(*args, **kwargs)
+
+
+def summarize_stages(records: list) -> dict:
+    """Per-stage count, mean, percentiles, max and total in ms over trace records.
+
+    A stage is counted only for images that ran it (e.g. no 'resize' with the
+    background pyramid). 'total' is the sum of all stages per image.
+    """
+    summary = {}
+    for stage in STAGES + ('total',):
+        values = np.array([record[stage] for record in records if stage in record], dtype=np.float64)
+        if len(values) == 0:
+            continue
+        summary[stage] = {
+            'count': int(len(values)),
+            'mean_ms': float(values.mean()),
+            **{f'p{q}_ms': float(np.percentile(values, q)) for q in PERCENTILES},
+            'max_ms': float(values.max()),
+            'total_ms': float(values.sum()),
+        }
+    return summary
+
+
+def format_stage_table(summary: dict) -> str:
+    """Text table of a stage summary with each stage's share of the total time."""
+    total = summary.get('total', {}).get('total_ms', 0.0)
+    header = f"{'stage':<12} {'count':>7} {'mean':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'share':>6}"
+    lines = [header, "-" * len(header)]
+    for stage, s in summary.items():
+        share = s['total_ms'] / total if total and stage != 'total' else 1.0
+        lines.append(f"{stage:<12} {s['count']:>7} {s['mean_ms']:>8.2f} {s['p50_ms']:>8.2f} {s['p90_ms']:>8.2f} "
+                     f"{s['p99_ms']:>8.2f} {s['max_ms']:>8.2f} {share:>6.1%}")
+    return "\n".join(lines)
+
+
+def write_trace(path: Path, records: list, append: bool = False) -> None:
+    """Write one JSON line of stage timings per image."""
+    with open(path, 'a' if append else 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def to_prometheus(summary: dict, prefix: str = 'synth') -> str:
+    """Render a stage summary as a Prometheus text-format summary metric in seconds."""
+    name = f"{prefix}_stage_seconds"
+    lines = [
+        f"# HELP {name} Per-image time spent in a synthetic generation stage.",
+        f"# TYPE {name} summary",
+    ]
+    for stage, s in summary.items():
+        for q in PERCENTILES:
+            lines.append(f'{name}{{stage="{stage}",quantile="{q / 100}"}} {s[f"p{q}_ms"] / 1000:.6f}')
+        lines.append(f'{name}_sum{{stage="{stage}"}} {s["total_ms"] / 1000:.6f}')
+        lines.append(f'{name}_count{{stage="{stage}"}} {s["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: Path, summary: dict, prefix: str = 'synth') -> None:
+    """Atomically write the summary in Prometheus text format (node_exporter textfile collector)."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'w') as f:
+        f.write(to_prometheus(summary, prefix))
+    os.replace(tmp, path)
@@ -0,0 +1,123 @@
+import io
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from PIL import Image
+import numpy as np
+from .telemetry import stage_timer
+
+JPEG_BACKENDS = ('pil', 'opencv')
+
+
+def opencv_available() -> bool:
+    """Whether OpenCV can be imported."""
+    try:
+        import cv2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def encode_jpeg(image, quality: int = 90, backend: str = 'pil') -> bytes:
+    """Encode a PIL image or RGB uint8 array to JPEG bytes with the given backend."""
+    if backend == 'opencv':
+        import cv2
+        arr = np.ascontiguousarray(np.asarray(image)[..., ::-1])
+        ok, buf = cv2.imencode('.jpg', arr, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            raise ValueError("OpenCV failed to encode JPEG")
+        return buf.tobytes()
+    if isinstance(image, np.ndarray):
+        image = Image.fromarray(image)
+    buf = io.BytesIO()
+    image.save(buf, format='JPEG', quality=quality)
+    return buf.getvalue()
+
+
+def benchmark_jpeg_backends(size: tuple = (1280, 960), quality: int = 90, iterations: int = 10) -> dict:
+    """Return mean encode time in ms per available backend on a smooth synthetic RGB image."""
+    rng = np.random.default_rng(0)
+    coarse = rng.integers(0, 256, (size[1] // 16, size[0] // 16, 3), dtype=np.uint8)
+    image = np.asarray(Image.fromarray(coarse).resize(size, Image.BILINEAR))
+
+    results = {}
+    for backend in JPEG_BACKENDS:
+        if backend == 'opencv' and not opencv_available():
+            continue
+        encode_jpeg(image, quality, backend)  # warm-up
+        t0 = time.perf_counter()
+        for _ in range(iterations):
+            encode_jpeg(image, quality, backend)
+        results[backend] = (time.perf_counter() - t0) / iterations * 1000
+    return results
+
+
+def select_jpeg_backend(backend: str = 'auto', quality: int = 90) -> str:
+    """Resolve 'auto' to the fastest backend by a micro-benchmark, validate explicit choices."""
+    if backend == 'auto':
+        timings = benchmark_jpeg_backends(quality=quality)
+        backend = min(timings, key=timings.get)
+        print(f"JPEG backend benchmark (ms/image): { {name: round(ms, 2) for name, ms in timings.items()} } -> {backend}")
+        return backend
+    if backend not in JPEG_BACKENDS:
+        raise ValueError(f"Unknown jpeg_backend: {backend}")
+    if backend == 'opencv' and not opencv_available():
+        raise ValueError("jpeg_backend='opencv' requires opencv-python")
+    return backend
+
+
+def write_sample(img_path: Path, lbl_path: Path, image, label_text: str, quality: int = 90, backend: str = 'pil', timings: dict = None) -> None:
+    """Encode and write one image with its YOLO label file, timing 'encode' and 'write' into timings."""
+    with stage_timer(timings, 'encode'):
+        data = encode_jpeg(image, quality, backend)
+    with stage_timer(timings, 'write'):
+        Path(img_path).write_bytes(data)
+        with open(lbl_path, 'w') as f:
+            f.write(label_text)
+
+
+class AsyncWriter:
+    """Bounded queue of encode/write tasks served by a thread pool.
+
+    ``submit`` blocks while ``max_pending`` tasks are queued or running, so
+    rendered images cannot pile up in memory. JPEG encoding and file I/O
+    release the GIL, so they overlap with composing the next scene. With
+    ``threads=0`` tasks run inline. ``close`` waits for all tasks and re-raises
+    the first error.
+    """
+
+    def __init__(self, threads: int = 2, max_pending: int = 8):
+        self.threads = threads
+        self._executor = ThreadPoolExecutor(max_workers=threads) if threads > 0 else None
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._futures = []
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs) and return its future."""
+        if self._executor is None:
+            future = Future()
+            future.set_result(fn(*args, **kwargs))
+            return future
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+        return future
+
+    def wait(self) -> None:
+        """Wait for all submitted tasks and re-raise the first error."""
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        try:
+            self.wait()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
@@ -4,6 +4,7 @@ import numpy as np
 import json
 import cv2
 import os
+import time
 import torch
 
 # SAHI imports for tiled inference
@@ -138,22 +139,86 @@ def setup_text_prompts(model):
     return model
 
 
-def perform_sahi_prediction(image_path, model_path, visual_prompts, conf, iou, slice_height=512, slice_width=512, overlap_height_ratio=0.2, overlap_width_ratio=0.2):
-    """Выполнение SAHI tiled inference для одного изображения."""
+# Загруженные SAHI-модели по (model_path, conf, device): модель создается один раз за процесс
+_SAHI_MODELS = {}
+
+
+def load_sahi_model(model_path, conf, device=None):
+    """Загрузка SAHI-модели YOLOE с кэшированием.
+
+    Повторные вызовы с теми же параметрами возвращают уже загруженную модель,
+    поэтому веса читаются с диска и переносятся на устройство один раз.
+
+    Parameters
+    ----------
+    model_path : str
+        Путь к весам YOLOE.
+    conf : float
+        Порог уверенности для предсказаний.
+    device : str, optional
+        Устройство ('cpu', 'cuda:0' или номер GPU, как в `device` конфига); при None
+        или 'auto' — 'cuda:0' при наличии GPU, иначе 'cpu'.
+
+    Returns
+    -------
+    tuple
+        (модель SAHI, время загрузки в секундах; 0 если модель взята из кэша).
+    """
     if not SAHI_AVAILABLE:
         raise ImportError(
             "❌ SAHI library is required for tiled inference but not installed!\n"
             "Please install SAHI with: pip install sahi\n"
             "Alternatively, set 'use_sahi': false in config.json to use standard inference."
         )
-
-    # Создаем модель SAHI для YOLOE
+    if device is None or device == 'auto':
+        device = 'cuda:0' if torch.cuda.is_available() else 'cpu'
+    elif str(device).isdigit():
+        device = f'cuda:{device}'
+    key = (model_path, conf, device)
+    if key in _SAHI_MODELS:
+        return _SAHI_MODELS[key], 0.0
+
+    t0 = time.perf_counter()
     detection_model = AutoDetectionModel.from_pretrained(
         model_type='ultralytics',
         model_path=model_path,
         confidence_threshold=conf,
-        device='cuda:0' if torch.cuda.is_available() else 'cpu'
+        device=device
     )
+    load_time = time.perf_counter() - t0
+    _SAHI_MODELS[key] = detection_model
+    return detection_model, load_time
+
+
+def perform_sahi_prediction(image_path, model_path, visual_prompts, conf, iou, slice_height=512, slice_width=512, overlap_height_ratio=0.2, overlap_width_ratio=0.2, detection_model=None):
+    """Выполнение SAHI tiled inference для одного изображения.
+
+    Parameters
+    ----------
+    image_path : str
+        Путь к изображению.
+    model_path : str
+        Путь к весам YOLOE; используется, если `detection_model` не передана.
+    visual_prompts : dict
+        Визуальные промпты (в SAHI-режиме не используются).
+    conf : float
+        Порог уверенности для предсказаний.
+    iou : float
+        Порог IoU для NMS.
+    slice_height, slice_width : int, optional
+        Размер тайла (default: 512).
+    overlap_height_ratio, overlap_width_ratio : float, optional
+        Перекрытие тайлов (default: 0.2).
+    detection_model : AutoDetectionModel, optional
+        Уже загруженная модель из `load_sahi_model`; без нее модель берется из кэша `load_sahi_model`.
+
+    Returns
+    -------
+    PredictionResult
+        Результат SAHI sliced prediction.
+    """
+    if detection_model is None:
+        detection_model, _ = load_sahi_model(model_path, conf)
 
     # Выполняем sliced prediction
     result = get_sliced_prediction(
@@ -240,23 +305,36 @@ def perform_prediction(model, img_paths, visual_prompts, conf, iou, runs_dir, de
             print(f"✅ Starting SAHI tiled prediction on {len(img_paths)} images")
             print(f"   Slice size: {sahi_slice_height}x{sahi_slice_width}, overlap: {sahi_overlap_height_ratio}")
 
+            # Модель загружается один раз на весь прогон
+            detection_model, load_time = load_sahi_model('yoloe-11l-seg.pt', conf, device)  # Используем путь к модели YOLOE
+            print(f"   SAHI model load: {load_time:.2f}s" if load_time else "   SAHI model: reused loaded model")
+
             all_results = []
+            infer_times = []
             for img_path in img_paths:
-                print(f"   Processing with SAHI: {os.path.basename(img_path)}")
+                t0 = time.perf_counter()
                 result = perform_sahi_prediction(
                     img_path,
-                    'yoloe-11l-seg.pt',  # Используем путь к модели YOLOE
+                    'yoloe-11l-seg.pt',
                     visual_prompts,
                     conf,
                     iou,
                     sahi_slice_height,
                     sahi_slice_width,
                     sahi_overlap_height_ratio,
-                    sahi_overlap_width_ratio
+                    sahi_overlap_width_ratio,
+                    detection_model=detection_model
                 )
+                infer_times.append(time.perf_counter() - t0)
                 all_results.append(result)
+                print(f"   Processing with SAHI: {os.path.basename(img_path)} - inference {infer_times[-1]:.2f}s")
 
             print(f'✅ SAHI prediction complete. Processed {len(img_paths)} images')
+            if infer_times:
+                total_infer = sum(infer_times)
+                load_note = f"model load {load_time:.2f}s (once)" if load_time else "model reused"
+                print(f"📊 SAHI timing: {load_note}, inference {total_infer:.2f}s total, "
+                      f"{total_infer / len(infer_times):.2f}s/image, {len(infer_times) / max(total_infer, 1e-9):.2f} img/s")
             return all_results
 
     else: